@@ -0,0 +1,52 @@
+import os
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# Configuration
+HEADLESS = os.environ.get("HEADLESS", "1") != "0"  # HEADLESS=0 opens a visible, maximized window
+DEBUGGER_ADDRESS = os.environ.get("CHROME_DEBUGGER_ADDRESS")  # Browser shared by run_full_demo.py
+
+# Flags for headless runs: no GPU/compositor, extensions or image decoding
+HEADLESS_ARGS = (
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+    "--window-size=1920,1080",  # Headless screenshots default to 800x600
+)
+HEADLESS_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+def _build_options():
+    """Chrome options for the current environment (shared browser, headless or visible)"""
+    chrome_options = Options()
+    if DEBUGGER_ADDRESS:
+        # Attach to the already-running browser instead of launching a new one
+        chrome_options.debugger_address = DEBUGGER_ADDRESS
+    elif HEADLESS:
+        for arg in HEADLESS_ARGS:
+            chrome_options.add_argument(arg)
+        chrome_options.add_experimental_option("prefs", HEADLESS_PREFS)
+    else:
+        chrome_options.add_argument("--start-maximized")
+    # Hand control back at DOMContentLoaded instead of waiting for every subresource
+    chrome_options.page_load_strategy = 'eager'
+    return chrome_options
+
+# Built once at import and reused by every driver this process starts
+_CACHED_OPTIONS = _build_options()
+
+def make_driver():
+    """Start (or attach to) Chrome with the demo's standard options"""
+    return webdriver.Chrome(options=_CACHED_OPTIONS)
+
+def close_driver(driver):
+    """Quit the driver, leaving a browser shared by run_full_demo.py running"""
+    if DEBUGGER_ADDRESS:
+        driver.service.stop()  # Leave the shared browser running for the next demo
+    else:
+        driver.quit()
@@ -0,0 +1,70 @@
+import os
+import io
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from PIL import Image  # Optional: screenshots are stored as WebP when available
+except ImportError:
+    Image = None
+
+# Configuration
+SCREENSHOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshots")
+os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
+# Screenshots are written behind the demo on one thread; the semaphore bounds
+# how many captured images can wait in memory
+SCREENSHOT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+SCREENSHOT_SLOTS = threading.BoundedSemaphore(8)
+
+def _write_png(filename, png):
+    """Write the captured PNG bytes unchanged"""
+    with open(filename, "wb") as f:
+        f.write(png)
+
+def _write_screenshot(filename, png):
+    """Encode and write one screenshot (runs on the screenshot executor)"""
+    try:
+        if Image is None:
+            _write_png(filename, png)
+        else:
+            try:
+                Image.open(io.BytesIO(png)).save(filename, "WEBP", quality=80, method=4)
+            except (OSError, KeyError, ValueError) as e:
+                # e.g. Pillow built without WebP support: keep the PNG instead
+                print(f"⚠️ WebP encoding failed ({e}); saving PNG instead")
+                if os.path.exists(filename):
+                    os.remove(filename)  # Drop any partial .webp
+                filename = os.path.splitext(filename)[0] + ".png"
+                _write_png(filename, png)
+        print(f"Screenshot saved: {filename}")
+    except Exception as e:
+        print(f"⚠️ Could not save screenshot {filename}: {e}")
+    finally:
+        SCREENSHOT_SLOTS.release()
+
+def take_screenshot(driver, name):
+    """
+    Capture a screenshot with a timestamped filename
+    
+    The PNG is captured synchronously, then encoded (lossy WebP when Pillow
+    is installed, PNG otherwise) and written on a background thread so the
+    demo can move on to the next browser action.
+    """
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    extension = "webp" if Image is not None else "png"
+    filename = f"{SCREENSHOTS_DIR}/{timestamp}_{name}.{extension}"
+    png = driver.get_screenshot_as_png()
+    SCREENSHOT_SLOTS.acquire()  # Blocks if too many writes are still pending
+    try:
+        SCREENSHOT_EXECUTOR.submit(_write_screenshot, filename, png)
+    except BaseException:
+        # Not queued (e.g. the executor was already shut down), so the writer
+        # will never release the slot
+        SCREENSHOT_SLOTS.release()
+        raise
+    print(f"Screenshot captured: {filename}")
+    return filename
+
+def flush_screenshots():
+    """Wait for all queued screenshot writes to finish"""
+    SCREENSHOT_EXECUTOR.shutdown(wait=True)
@@ -4,50 +4,373 @@ import random
 import string
 import shutil
 import sys
+import functools
+import atexit
+import json
+import threading
+from types import MappingProxyType
+from urllib.parse import urljoin
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+from selenium.common.exceptions import (
+    TimeoutException, ElementClickInterceptedException, StaleElementReferenceException,
+    JavascriptException, WebDriverException
+)
 import requests
+from web3 import Web3
+from _screenshots import SCREENSHOTS_DIR, take_screenshot, flush_screenshots
 
 # Configuration
 BASE_URL = "http://127.0.0.1:5000"  # Flask app URL
 DEMO_FOLDER = os.path.dirname(os.path.abspath(__file__))
-SCREENSHOTS_DIR = os.path.join(DEMO_FOLDER, "screenshots")
 GANACHE_URL = "http://localhost:7545"  # Default Ganache URL
+FAST_MODE = os.environ.get("DEMO_FAST") == "1"  # Skip typing animation for batch/CI runs
+VISUAL = os.environ.get("DEMO_VISUAL", "1") == "1"  # Set DEMO_VISUAL=0 to skip element highlighting
+
+# Element handles reused across operations on the same page, keyed by (session, page URL)
+PAGE_CACHE = {}
+
+# Winning locators from previous runs, tried first on the next run
+LOCATORS_FILE = os.path.join(DEMO_FOLDER, "locators.json")
+
+# Keep-alive HTTP session shared by all direct requests to the Flask app
+SESSION = requests.Session()
+
+# Shared Web3 client for Ganache; reuses one pooled HTTP session for all RPC calls
+W3 = Web3(Web3.HTTPProvider(GANACHE_URL, request_kwargs={'timeout': 1}))
 
 # Correctly mapped routes based on backend route definitions
-AUTH_ROUTES = {
-    'login': f"{BASE_URL}/auth/login",
-    'signup': f"{BASE_URL}/auth/signup",
-    'logout': f"{BASE_URL}/auth/logout"
-}
+@functools.cache
+def _routes():
+    """Build every route URL from BASE_URL once and freeze the tables"""
+    def url(path):
+        return urljoin(BASE_URL, path)
+
+    return {
+        'auth': MappingProxyType({
+            'login': url("/auth/login"),
+            'signup': url("/auth/signup"),
+            'logout': url("/auth/logout")
+        }),
+        'user': MappingProxyType({
+            'dashboard': url("/user/dashboard"),
+            'profile': url("/user/profile"),
+            'upload_page': url("/user/upload-document")  # GET - form page
+        }),
+        'view': MappingProxyType({
+            'all_documents': url("/view/documents"),  # Primary route
+            'documents_alt': url("/documents"),       # Alternative route
+            'document_details': url("/view/document")  # /<document_id> will be appended
+        }),
+        'upload': MappingProxyType({
+            'upload_submit': url("/upload"),                    # POST endpoint
+            'multiple_upload': url("/upload/multiple"),         # POST endpoint
+            'delete_document': url("/upload/document/delete"),  # /<document_id> will be appended
+            'upload_version': url("/upload/version")            # /<document_id> will be appended
+        }),
+        'security': MappingProxyType({
+            'verification_page': url("/security/verification"),
+            'verify_document': url("/security/verify-document"),         # /<document_id> will be appended
+            'verify_blockchain': url("/security/verify-document-blockchain") # /<document_id> will be appended
+        })
+    }
+
+AUTH_ROUTES = _routes()['auth']
+USER_ROUTES = _routes()['user']
+VIEW_ROUTES = _routes()['view']
+UPLOAD_ROUTES = _routes()['upload']
+SECURITY_ROUTES = _routes()['security']
+
+# Candidate locators for each page element, tried in order; looked up by semantic name
+PATTERNS = MappingProxyType({
+    'login_button': (
+        (By.XPATH, "//button[contains(text(), 'Login') or contains(text(), 'Sign In')]"),
+        (By.XPATH, "//button[contains(@type, 'submit')]"),
+        (By.XPATH, "//input[contains(@type, 'submit')]"),
+        (By.CSS_SELECTOR, "button.btn-primary"),
+        (By.CSS_SELECTOR, "form button"),
+    ),
+    'document_name': (
+        (By.NAME, "document_name"),
+        (By.ID, "document_name"),
+        (By.CSS_SELECTOR, "input[placeholder*='name' i]"),
+        (By.CSS_SELECTOR, "input[type='text']"),
+    ),
+    'document_description': (
+        (By.NAME, "document_description"),
+        (By.ID, "document_description"),
+        (By.TAG_NAME, "textarea"),
+        (By.CSS_SELECTOR, "textarea"),
+    ),
+    'document_tags': (
+        (By.NAME, "tags"),
+        (By.ID, "tags"),
+        (By.CSS_SELECTOR, "input[placeholder*='tag' i]"),
+    ),
+    'file_input': (
+        (By.NAME, "file"),
+        (By.ID, "file"),
+        (By.CSS_SELECTOR, "input[type='file']"),
+        (By.XPATH, "//input[@type='file']"),
+    ),
+    'upload_submit': (
+        (By.XPATH, "//button[contains(text(), 'Upload')]"),
+        (By.XPATH, "//button[contains(text(), 'Submit')]"),
+        (By.XPATH, "//button[@type='submit']"),
+        (By.CSS_SELECTOR, "form button[type='submit']"),
+        (By.CSS_SELECTOR, "button.btn-primary"),
+        (By.CSS_SELECTOR, "form button"),
+    ),
+    'search_input': (
+        (By.ID, "keyword-search"),
+        (By.NAME, "keyword"),
+        (By.NAME, "search"),
+        (By.CSS_SELECTOR, "input[placeholder*='search' i]"),
+        (By.CSS_SELECTOR, "input[placeholder*='keyword' i]"),
+        (By.CSS_SELECTOR, "input[type='text']"),
+    ),
+    'search_button': (
+        (By.XPATH, "//button[contains(text(), 'Search')]"),
+        (By.CSS_SELECTOR, "button.search-button"),
+        (By.CSS_SELECTOR, "button[type='submit']"),
+        (By.XPATH, "//button[contains(@class, 'search')]"),
+        (By.XPATH, "//i[contains(@class, 'fa-search')]/parent::button"),
+    ),
+    'document_id': (
+        (By.CSS_SELECTOR, ".document-id"),
+        (By.CSS_SELECTOR, "[data-document-id]"),
+        (By.CSS_SELECTOR, ".meta-value"),
+    ),
+    'verify_link': (
+        (By.XPATH, "//a[contains(text(), 'Verify')]"),
+        (By.XPATH, "//button[contains(text(), 'Verify')]"),
+        (By.XPATH, "//a[contains(@href, 'verif')]"),
+        (By.XPATH, "//a[contains(@class, 'verify')]"),
+    ),
+    'logout': (
+        (By.XPATH, "//a[contains(text(), 'Logout')]"),
+        (By.XPATH, "//button[contains(text(), 'Logout')]"),
+        (By.XPATH, "//a[contains(@href, 'logout')]"),
+        (By.XPATH, "//a[contains(text(), 'Sign Out')]"),
+    ),
+})
 
-USER_ROUTES = {
-    'dashboard': f"{BASE_URL}/user/dashboard",
-    'profile': f"{BASE_URL}/user/profile",
-    'upload_page': f"{BASE_URL}/user/upload-document"  # GET - form page
-}
+# Catch-all locators from PATTERNS that can match the wrong element. They are
+# still tried in their listed place, but SelectorCache never promotes them.
+FALLBACK_LOCATORS = frozenset({
+    (By.XPATH, "//button[contains(@type, 'submit')]"),
+    (By.XPATH, "//input[contains(@type, 'submit')]"),
+    (By.XPATH, "//button[@type='submit']"),
+    (By.XPATH, "//input[@type='file']"),
+    (By.CSS_SELECTOR, "button.btn-primary"),
+    (By.CSS_SELECTOR, "button[type='submit']"),
+    (By.CSS_SELECTOR, "form button[type='submit']"),
+    (By.CSS_SELECTOR, "form button"),
+    (By.CSS_SELECTOR, "input[type='text']"),
+    (By.CSS_SELECTOR, "input[type='file']"),
+    (By.CSS_SELECTOR, "textarea"),
+    (By.CSS_SELECTOR, ".meta-value"),
+    (By.TAG_NAME, "textarea"),
+})
 
-VIEW_ROUTES = {
-    'all_documents': f"{BASE_URL}/view/documents",  # Primary route
-    'documents_alt': f"{BASE_URL}/documents",       # Alternative route
-    'document_details': f"{BASE_URL}/view/document"  # /<document_id> will be appended
-}
+# One XPath covering the View links/buttons of the first three document cards
+VIEW_BUTTONS_XPATH = (
+    "(//div[contains(concat(' ', normalize-space(@class), ' '), ' document-card ')])[position() <= 3]"
+    "//*[self::a or self::button]"
+    "[(contains(text(), 'View') and not(contains(text(), 'Open')))"
+    " or contains(@href, 'view/document') or contains(@href, 'document/')]"
+)
 
-UPLOAD_ROUTES = {
-    'upload_submit': f"{BASE_URL}/upload",                    # POST endpoint
-    'multiple_upload': f"{BASE_URL}/upload/multiple",         # POST endpoint
-    'delete_document': f"{BASE_URL}/upload/document/delete",  # /<document_id> will be appended
-    'upload_version': f"{BASE_URL}/upload/version"            # /<document_id> will be appended
-}
+# CSS unions used to locate auth form fields in a single query
+NAME_CSS = "input[name='name'], input#name, input[name='fullname'], input#fullname, input[placeholder*='name' i]"
+EMAIL_CSS = "input[name='email'], input#email, input[type='email'], input[placeholder*='email' i]"
+PASSWORD_CSS = "input[name='password'], input#password, input[type='password']"
+
+# Browser-side scripts, kept as constant strings so each is sent verbatim and
+# Chrome can reuse its compiled form; per-call values go through arguments[]
+_JS_FULLSCREEN = """
+    if (document.documentElement.requestFullscreen) {
+        document.documentElement.requestFullscreen();
+    } else if (document.documentElement.mozRequestFullscreen) {
+        document.documentElement.mozRequestFullscreen();
+    } else if (document.documentElement.webkitRequestFullscreen) {
+        document.documentElement.webkitRequestFullscreen();
+    } else if (document.documentElement.msRequestFullscreen) {
+        document.documentElement.msRequestFullscreen();
+    }
+"""
 
-SECURITY_ROUTES = {
-    'verification_page': f"{BASE_URL}/security/verification",
-    'verify_document': f"{BASE_URL}/security/verify-document",         # /<document_id> will be appended
-    'verify_blockchain': f"{BASE_URL}/security/verify-document-blockchain" # /<document_id> will be appended
-}
+_JS_SCROLL_TO = "window.scrollTo(0, arguments[0]);"
+
+_JS_SHOW_INDICATOR = """
+    var indicator = document.createElement('div');
+    indicator.innerHTML = arguments[0];
+    indicator.style.position = 'fixed';
+    indicator.style.right = '20px';
+    indicator.style.top = '20px';
+    indicator.style.backgroundColor = 'rgba(0,0,0,0.7)';
+    indicator.style.color = 'white';
+    indicator.style.padding = '8px 15px';
+    indicator.style.borderRadius = '4px';
+    indicator.style.zIndex = '9999';
+    indicator.id = 'scroll-indicator';
+    document.body.appendChild(indicator);
+"""
+
+_JS_HIDE_INDICATOR = """
+    var indicator = document.getElementById('scroll-indicator');
+    if (indicator) document.body.removeChild(indicator);
+"""
+
+_JS_HIGHLIGHT_ON = """
+    var el = arguments[0], color = arguments[1];
+    
+    // Add pulsating animation
+    var styleTag = document.createElement('style');
+    styleTag.id = 'highlight-animation';
+    styleTag.innerHTML =
+        '@keyframes highlight-pulse {' +
+        '0% { box-shadow: 0 0 0 0 ' + color + '80; }' +
+        '70% { box-shadow: 0 0 0 10px ' + color + '00; }' +
+        '100% { box-shadow: 0 0 0 0 ' + color + '00; }' +
+        '}';
+    document.head.appendChild(styleTag);
+    
+    el.style.boxShadow = '0 0 5px ' + color;
+    el.style.border = '2px solid ' + color;
+    el.style.transition = 'all 0.3s';
+    el.style.animation = 'highlight-pulse 1.5s infinite';
+    el.style.position = 'relative';
+    el.style.zIndex = '10';
+"""
+
+_JS_HIGHLIGHT_OFF = """
+    var styleTag = document.getElementById('highlight-animation');
+    if (styleTag) document.head.removeChild(styleTag);
+    
+    arguments[0].setAttribute('style', arguments[1]);
+"""
+
+# Shared JS helper: [element, index] of the first match in a list of [kind, value] selectors
+_JS_FIRST_MATCH = """
+    function firstMatch(sels, root, visibleOnly) {
+        for (var i = 0; i < sels.length; i++) {
+            var kind = sels[i][0], value = sels[i][1], found = [];
+            if (kind === 'xpath') {
+                var res = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (var j = 0; j < res.snapshotLength; j++) found.push(res.snapshotItem(j));
+            } else {
+                found = root.querySelectorAll(value);
+            }
+            for (var k = 0; k < found.length; k++) {
+                var el = found[k];
+                if (!visibleOnly || el.offsetWidth || el.offsetHeight || el.getClientRects().length) return [el, i];
+            }
+        }
+        return null;
+    }
+"""
+
+_JS_FIND_FIRST = _JS_FIRST_MATCH + """
+    return firstMatch(arguments[0], document, arguments[1]);
+"""
+
+# Resolve with firstMatch(arguments[0]) over visible elements as soon as the DOM
+# produces one, or null after arguments[1] ms. A 100 ms re-check backs up the
+# observer for elements revealed without a mutation (e.g. CSS transitions).
+_JS_WAIT_FOR_FIRST = _JS_FIRST_MATCH + """
+    var sels = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+    var hit = firstMatch(sels, document, true);
+    if (hit) { done(hit); return; }
+    var timer, poll, observer = new MutationObserver(check);
+    function finish(result) {
+        observer.disconnect(); clearTimeout(timer); clearInterval(poll); done(result);
+    }
+    function check() {
+        var match = firstMatch(sels, document, true);
+        if (match) finish(match);
+    }
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    poll = setInterval(check, 100);
+    timer = setTimeout(function() { finish(null); }, timeoutMs);
+"""
+
+# Resolve several named fields at once: {name: [selectors, visibleOnly]} -> {name: [element, index]}
+_JS_FIND_FIELDS = _JS_FIRST_MATCH + """
+    var fields = arguments[0], out = {};
+    for (var name in fields) out[name] = firstMatch(fields[name][0], document, fields[name][1]);
+    return out;
+"""
+
+# Upper bound for one upload POST: S3 storage, AI extraction and a synchronous
+# on-chain transaction all happen before the redirect
+UPLOAD_TIMEOUT = 60
+
+# Flash/alert message containers rendered by the app
+ALERT_CSS = ".alert, .flash-message, .notification"
+
+# Resolve with the first element matching arguments[0] as soon as one is in the DOM, or null after arguments[1] ms
+_JS_WAIT_FOR_ALERT = """
+    var sel = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+    var found = document.querySelector(sel);
+    if (found) { done(found); return; }
+    var observer = new MutationObserver(function() {
+        var match = document.querySelector(sel);
+        if (match) { observer.disconnect(); done(match); }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    setTimeout(function() { observer.disconnect(); done(null); }, timeoutMs);
+"""
+
+# Text, class, href and visibility of each element in arguments[0]
+_JS_ELEMENT_PROPS = """
+    return arguments[0].map(function(el) {
+        return {
+            text: el.innerText.trim(),
+            cls: el.getAttribute('class') || '',
+            href: el.href || null,
+            visible: !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+        };
+    });
+"""
+
+# Document ID from the /document/<id> URL, else the first ID-like text in the given elements
+_JS_FIND_DOCUMENT_ID = """
+    var urlMatch = location.pathname.match(/\\/document\\/([^\\/]+)/);
+    if (urlMatch) return decodeURIComponent(urlMatch[1]);
+    var els = document.querySelectorAll(arguments[0]);
+    for (var i = 0; i < els.length; i++) {
+        var text = els[i].textContent.trim();
+        if (text.length > 8 && text.indexOf('-') > -1) return text;
+    }
+    return null;
+"""
+
+# Locate the signup button browser-side: text match first, then generic submit buttons
+_JS_FIND_SIGNUP_BUTTON = """
+    var byText = Array.from(document.querySelectorAll('button')).find(function(b) {
+        return /sign ?up|register/i.test(b.innerText);
+    });
+    if (byText) return byText;
+    var sels = ["input[type='submit']", "form button[type='submit']", "button.btn-primary"];
+    for (var i = 0; i < sels.length; i++) {
+        var el = document.querySelector(sels[i]);
+        if (el) return el;
+    }
+    return null;
+"""
+
+# Locate the verify-document button browser-side: first visible button whose
+# text mentions "verify", then the id/class fallbacks
+_JS_FIND_VERIFY_BUTTON = """
+    var byText = Array.from(document.querySelectorAll('button')).find(function(b) {
+        return /verify/i.test(b.textContent) && b.offsetParent !== null;
+    });
+    if (byText) return byText;
+    return document.getElementById('verify-btn') || document.querySelector("button[class*='primary']");
+"""
 
 # Create unique email for this demo run to avoid duplicates
 DEMO_EMAIL = f"demo_user_{int(time.time())}@example.com"
@@ -95,64 +418,345 @@ def create_demo_files():
             import sys
             sys.exit(1)
 
-def take_screenshot(driver, name):
-    """Take a screenshot and save it with a timestamp"""
-    os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
-    filename = f"{SCREENSHOTS_DIR}/{timestamp}_{name}.png"
-    driver.save_screenshot(filename)
-    print(f"Screenshot saved: {filename}")
-    return filename
-
 def wait_and_click(driver, selector, timeout=10):
-    """Wait for an element to be clickable then click it"""
+    """Wait for an element to be clickable, scroll it into view, then click it"""
     try:
         element = WebDriverWait(driver, timeout).until(
             EC.element_to_be_clickable(selector)
         )
+    except TimeoutException:
+        print(f"Timeout waiting for element: {selector}")
+        take_screenshot(driver, f"error_waiting_for_{selector[1].replace('/', '_')}")
+        return None
+    
+    # Bring the element into the viewport first so the native click lands
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+    try:
         element.click()
-        return element
     except ElementClickInterceptedException:
-        # Try JavaScript click if normal click is intercepted
-        element = driver.find_element(*selector)
+        # Only an overlay can still intercept the click now; use a JavaScript click
         driver.execute_script("arguments[0].click();", element)
+    return element
+
+def set_file_input(driver, file_input, path):
+    """
+    Attach a file to the given file input through the DevTools protocol
+    
+    Uses DOM.setFileInputFiles so the path is set in one command instead of
+    being typed into the element. The element is briefly tagged with a marker
+    attribute so CDP can resolve that exact node (pages may have several file
+    inputs). Falls back to send_keys when CDP is not available (e.g.
+    non-Chromium drivers) or the node cannot be resolved.
+    """
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        file_input.send_keys(path)
+        return
+    driver.execute_script("arguments[0].setAttribute('data-demo-file-input', '1');", file_input)
+    try:
+        remote = driver.execute_cdp_cmd('Runtime.evaluate', {
+            'expression': "document.querySelector('[data-demo-file-input]')"
+        })['result']
+        if not remote.get('objectId'):
+            raise LookupError("file input not found via CDP")
+        backend_id = driver.execute_cdp_cmd(
+            'DOM.describeNode', {'objectId': remote['objectId']}
+        )['node']['backendNodeId']
+        driver.execute_cdp_cmd('DOM.setFileInputFiles', {'files': [path], 'backendNodeId': backend_id})
+    except (LookupError, WebDriverException):
+        file_input.send_keys(path)
+    finally:
+        driver.execute_script("arguments[0].removeAttribute('data-demo-file-input');", file_input)
+
+def _to_js_selector(selector):
+    """Translate a (By, value) locator into the [kind, value] pair used by _JS_FIND_FIRST"""
+    by, value = selector
+    if by == By.XPATH:
+        return ['xpath', value]
+    if by == By.ID:
+        return ['css', f'[id="{value}"]']
+    if by == By.NAME:
+        return ['css', f'[name="{value}"]']
+    if by == By.CLASS_NAME:
+        return ['css', f'.{value}']
+    return ['css', value]  # CSS selectors and tag names are already valid CSS
+
+def _match_first(driver, selectors, visible=False):
+    """
+    Return (element, winning locator) for the first of the given locators that matches, or (None, None)
+    
+    All candidates are evaluated inside the browser in a single round-trip,
+    in the order given.
+    
+    Parameters:
+    - selectors: List of (By, value) locators to try
+    - visible: Only return elements that are rendered on the page
+    """
+    hit = driver.execute_script(
+        _JS_FIND_FIRST, [_to_js_selector(s) for s in selectors], visible
+    )
+    if not hit:
+        return None, None
+    return hit[0], selectors[hit[1]]
+
+def with_form(driver, page_key, action):
+    """
+    Run action(form) against the page's <form>, reusing a cached handle
+    
+    The form is looked up once per browser session and page key (the URL that
+    was loaded) and kept in PAGE_CACHE. If the handle has gone stale because
+    the page was reloaded, it is fetched again and the action retried once.
+    Returns None without calling action if the page has no form.
+    """
+    key = (driver.session_id, page_key)
+    form = PAGE_CACHE.get(key)
+    if form is not None:
+        try:
+            return action(form)
+        except StaleElementReferenceException:
+            pass
+    forms = driver.find_elements(By.TAG_NAME, "form")
+    if not forms:
+        PAGE_CACHE.pop(key, None)
+        return None
+    form = PAGE_CACHE[key] = forms[0]
+    return action(form)
+
+def _match_fields(driver, fields, visible=()):
+    """
+    Resolve several form fields in one browser round-trip
+    
+    Parameters:
+    - fields: Dict mapping a field name to its list of (By, value) locators
+    - visible: Field names that must match a rendered element
+    
+    Returns a dict mapping each field name to (element, winning locator),
+    or (None, None) when nothing matched.
+    """
+    payload = {
+        name: [[_to_js_selector(s) for s in selectors], name in visible]
+        for name, selectors in fields.items()
+    }
+    hits = driver.execute_script(_JS_FIND_FIELDS, payload)
+    return {
+        name: (hit[0], fields[name][hit[1]]) if hit else (None, None)
+        for name, hit in hits.items()
+    }
+
+def _wait_for_match(driver, selectors, timeout=5):
+    """
+    Wait until any of the given locators matches a visible element
+    
+    A MutationObserver in the page re-checks all candidates whenever the DOM
+    changes, so the element is returned as soon as it appears rather than on
+    the next Python-side poll; a short in-page timer catches elements that
+    become visible without a DOM mutation. The worst-case wait is `timeout`
+    overall. Returns (element, winning locator), or (None, None) if nothing
+    appeared in time or a navigation tore down the waiting script.
+    """
+    try:
+        hit = driver.execute_async_script(
+            _JS_WAIT_FOR_FIRST, [_to_js_selector(s) for s in selectors], int(timeout * 1000)
+        )
+    except (TimeoutException, JavascriptException):
+        hit = None
+    if not hit:
+        return None, None
+    return hit[0], selectors[hit[1]]
+
+class SelectorCache:
+    """
+    Remembers which locator matched each field, persisted between demo runs
+    
+    Entries are keyed by (page key, field name). On lookup the remembered
+    locator is moved to the front of the fallback list, so it is the first
+    one the browser tries; whichever locator matches is written back. Generic
+    catch-alls (FALLBACK_LOCATORS) are never remembered, and a cached one left
+    over from an older run is evicted, so they cannot jump ahead of the
+    specific locators.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.dirty = False
+        try:
+            with open(path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    @staticmethod
+    def _key(page_key, field):
+        return f"{page_key}|{field}"
+    
+    def ordered(self, page_key, field, selectors):
+        """Return selectors with the cached winner (if still listed) first"""
+        key = self._key(page_key, field)
+        selectors = tuple(selectors)
+        cached = self.entries.get(key)
+        if cached and tuple(cached) in FALLBACK_LOCATORS:
+            del self.entries[key]
+            self.dirty = True
+            cached = None
+        if cached:
+            cached = tuple(cached)
+            if cached in selectors:
+                return (cached,) + tuple(s for s in selectors if s != cached)
+        return selectors
+    
+    def remember(self, page_key, field, selector):
+        """Record the locator that matched for this field"""
+        key = self._key(page_key, field)
+        if selector is None or tuple(selector) in FALLBACK_LOCATORS:
+            return
+        if self.entries.get(key) != list(selector):
+            self.entries[key] = list(selector)
+            self.dirty = True
+    
+    def resolve(self, driver, page_key, field, selectors, visible=False):
+        """Return the first matching element for a field, trying the cached locator first"""
+        element, selector = _match_first(
+            driver, self.ordered(page_key, field, selectors), visible
+        )
+        self.remember(page_key, field, selector)
+        return element
+    
+    def wait(self, driver, page_key, field, selectors, timeout=5):
+        """Wait for a field's element (see _wait_for_match), trying the cached locator first"""
+        element, selector = _wait_for_match(
+            driver, self.ordered(page_key, field, selectors), timeout
+        )
+        self.remember(page_key, field, selector)
         return element
+    
+    def resolve_fields(self, driver, page_key, fields, visible=()):
+        """Resolve several fields in one round-trip (see _match_fields), cached locators first"""
+        ordered = {
+            name: self.ordered(page_key, name, selectors) for name, selectors in fields.items()
+        }
+        hits = _match_fields(driver, ordered, visible)
+        for name, (_, selector) in hits.items():
+            self.remember(page_key, name, selector)
+        return {name: element for name, (element, _) in hits.items()}
+    
+    def save(self):
+        """Write the cache back to disk if anything changed"""
+        if not self.dirty:
+            return
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save selector cache: {e}")
+
+LOCATOR_CACHE = SelectorCache(LOCATORS_FILE)
+atexit.register(LOCATOR_CACHE.save)
+
+def element_props(driver, elements):
+    """Read text/cls/href/visible for several elements in a single round-trip"""
+    if not elements:
+        return []
+    return driver.execute_script(_JS_ELEMENT_PROPS, list(elements))
+
+def wait_for_url_change(driver, old_url, timeout=8):
+    """Wait until the browser navigates away from old_url; returns False on timeout"""
+    try:
+        WebDriverWait(driver, timeout).until(lambda d: d.current_url != old_url)
+        return True
     except TimeoutException:
-        print(f"Timeout waiting for element: {selector}")
-        take_screenshot(driver, f"error_waiting_for_{selector[1].replace('/', '_')}")
+        return False
+
+def wait_for_page_replaced(driver, old_page, timeout=8):
+    """
+    Wait until old_page (the previous <html> element) is detached; returns False on timeout
+    
+    Unlike wait_for_url_change this also catches a reload of the same URL,
+    e.g. a form POST that redirects back to the form with an error flash.
+    """
+    try:
+        WebDriverWait(driver, timeout).until(EC.staleness_of(old_page))
+        return True
+    except TimeoutException:
+        return False
+
+def wait_for_readystate(driver, timeout=5):
+    """Wait until the current document has finished loading; returns False on timeout"""
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def nav_and_probe(driver, url):
+    """Load url and return (document.title, document.readyState) in one follow-up call"""
+    driver.get(url)
+    return tuple(driver.execute_script("return [document.title, document.readyState];"))
+
+def wait_for_alert(driver, timeout=8):
+    """
+    Wait for a flash/alert message to appear; returns the element or None
+    
+    A MutationObserver in the page resolves the moment an alert is inserted,
+    instead of polling from Python. A navigation that unloads the page while
+    the script waits also counts as no alert.
+    """
+    try:
+        return driver.execute_async_script(_JS_WAIT_FOR_ALERT, ALERT_CSS, int(timeout * 1000))
+    except (TimeoutException, JavascriptException):
         return None
 
 def is_server_running():
     """Check if the Flask server is running"""
     try:
-        response = requests.get(f"{BASE_URL}/api/health", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/api/health", timeout=5)
         return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
 
+def _warm_routes():
+    """Hit the first pages the browser will load so Flask is already warm"""
+    for url in (AUTH_ROUTES['signup'], AUTH_ROUTES['login']):
+        try:
+            SESSION.get(url, stream=True, timeout=5).close()
+        except requests.exceptions.RequestException:
+            pass
+
+def warm_up_server():
+    """Pre-warm the Flask app on a background thread (fire-and-forget)"""
+    threading.Thread(target=_warm_routes, daemon=True).start()
+
+@functools.cache
+def resolve_upload_url():
+    """
+    Return the upload form URL that exists on the server, probed only once
+    
+    Tries the primary route, then the direct route without the user prefix.
+    Redirects (e.g. to login) are not followed; anything but a 404 means the
+    route exists.
+    """
+    fallback_url = urljoin(BASE_URL, "/upload-document")
+    for url in (USER_ROUTES['upload_page'], fallback_url):
+        try:
+            if SESSION.head(url, allow_redirects=False, timeout=5).status_code != 404:
+                return url
+        except requests.exceptions.RequestException:
+            pass
+        print(f"⚠️ Upload URL not available: {url}")
+    return USER_ROUTES['upload_page']
+
 def is_ganache_running():
     """Check if Ganache is running"""
     try:
-        # First try the standard HTTP endpoint
-        response = requests.get(GANACHE_URL, timeout=3)
-        if response.status_code == 200:
-            print("✅ Ganache HTTP server detected at port 7545")
+        if W3.is_connected():
+            print("✅ Connected to Ganache via Web3")
             return True
-    except requests.exceptions.RequestException:
-        # If HTTP check fails, try a different approach for Ganache GUI
-        try:
-            # Try Web3 connection which works better with Ganache GUI
-            from web3 import Web3
-            w3 = Web3(Web3.HTTPProvider(GANACHE_URL))
-            if w3.is_connected():
-                print("✅ Connected to Ganache via Web3")
-                return True
-            else:
-                print("⚠️ Web3 connection to Ganache failed")
-        except Exception as e:
-            print(f"⚠️ Alternative Ganache check failed: {str(e)}")
+        print("⚠️ Web3 connection to Ganache failed")
+    except Exception as e:
+        print(f"⚠️ Ganache check failed: {str(e)}")
     
-    # At this point, both checks have failed
+    # At this point the check has failed
     print("ℹ️ Could not automatically detect Ganache")
     user_confirm = input("Are you sure Ganache is running? (y/n): ")
     return user_confirm.lower() == 'y'
@@ -184,6 +788,9 @@ def debug_form_fields(driver):
     
     print("--- End of Form Debug ---\n")
 
+# Characters after which type_naturally pauses a little longer
+_PUNCT = frozenset('.,!?;:-')
+
 def type_naturally(input_field, text, speed='medium'):
     """
     Simulates more natural typing with variable speed for better video presentation
@@ -192,10 +799,17 @@ def type_naturally(input_field, text, speed='medium'):
     - input_field: The element to type into
     - text: The text to type
     - speed: 'slow', 'medium', 'fast'
+    
+    Set DEMO_FAST=1 to skip the animation and type the text in one call.
     """
     # Clear the field first
     input_field.clear()
     
+    # In fast mode send the whole string in a single WebDriver command
+    if FAST_MODE:
+        input_field.send_keys(text)
+        return
+    
     # Determine the base delay between keypresses
     base_delays = {
         'slow': 0.15,      # Slower for emphasis
@@ -204,18 +818,17 @@ def type_naturally(input_field, text, speed='medium'):
     }
     base_delay = base_delays.get(speed, 0.08)
     
-    # Type with slight randomization for naturalistic effect
-    for char in text:
-        # Variable delay between characters (realistic typing effect)
-        variation = base_delay * (0.8 + 0.4 * random.random())
-        
-        # Longer pause for punctuation
-        if char in ['.', ',', '!', '?', ';', ':', '-']:
-            variation *= 1.5
-        
+    # Precompute per-character delays with slight randomization for naturalistic
+    # effect, pausing longer after punctuation
+    delays = [
+        base_delay * (0.8 + 0.4 * random.random()) * (1.5 if char in _PUNCT else 1.0)
+        for char in text
+    ]
+    
+    for char, delay in zip(text, delays):
         # Send single character
         input_field.send_keys(char)
-        time.sleep(variation)
+        time.sleep(delay)
     
     # Pause slightly at the end of typing
     time.sleep(0.3)
@@ -229,10 +842,10 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
     - speed: 'slow', 'medium', or 'fast'
     - distance: Number of pixels to scroll (if None, scroll ~80% of viewport)
     """
-    # Get viewport height
-    viewport_height = driver.execute_script("return window.innerHeight")
-    total_height = driver.execute_script("return document.body.scrollHeight")
-    current_position = driver.execute_script("return window.pageYOffset")
+    # Get viewport height, page height and scroll position in one round-trip
+    viewport_height, total_height, current_position = driver.execute_script(
+        "return [window.innerHeight, document.body.scrollHeight, window.pageYOffset];"
+    )
     
     # Determine scroll parameters
     if distance is None:
@@ -262,20 +875,7 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
         print(f"Scrolling to TOP from position {current_position}")
         # Create a visual indicator for scrolling up
         try:
-            driver.execute_script("""
-                var indicator = document.createElement('div');
-                indicator.innerHTML = '⬆️ Scrolling to top...';
-                indicator.style.position = 'fixed';
-                indicator.style.right = '20px';
-                indicator.style.top = '20px';
-                indicator.style.backgroundColor = 'rgba(0,0,0,0.7)';
-                indicator.style.color = 'white';
-                indicator.style.padding = '8px 15px';
-                indicator.style.borderRadius = '4px';
-                indicator.style.zIndex = '9999';
-                indicator.id = 'scroll-indicator';
-                document.body.appendChild(indicator);
-            """)
+            driver.execute_script(_JS_SHOW_INDICATOR, '⬆️ Scrolling to top...')
         except:
             pass
             
@@ -283,19 +883,16 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
         steps = 15
         for i in range(steps, 0, -1):
             pos = int(current_position * i / steps)
-            driver.execute_script(f"window.scrollTo(0, {pos});")
+            driver.execute_script(_JS_SCROLL_TO, pos)
             time.sleep(delay * 2)  # Slightly longer delay for top scrolling
         
         # Final scroll to top
-        driver.execute_script("window.scrollTo(0, 0);")
+        driver.execute_script(_JS_SCROLL_TO, 0)
         time.sleep(0.5)
         
         # Remove the indicator
         try:
-            driver.execute_script("""
-                var indicator = document.getElementById('scroll-indicator');
-                if (indicator) document.body.removeChild(indicator);
-            """)
+            driver.execute_script(_JS_HIDE_INDICATOR)
         except:
             pass
         return
@@ -305,20 +902,7 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
         print(f"Scrolling to BOTTOM")
         # Create a visual indicator for scrolling down
         try:
-            driver.execute_script("""
-                var indicator = document.createElement('div');
-                indicator.innerHTML = '⬇️ Scrolling down...';
-                indicator.style.position = 'fixed';
-                indicator.style.right = '20px';
-                indicator.style.top = '20px';
-                indicator.style.backgroundColor = 'rgba(0,0,0,0.7)';
-                indicator.style.color = 'white';
-                indicator.style.padding = '8px 15px';
-                indicator.style.borderRadius = '4px';
-                indicator.style.zIndex = '9999';
-                indicator.id = 'scroll-indicator';
-                document.body.appendChild(indicator);
-            """)
+            driver.execute_script(_JS_SHOW_INDICATOR, '⬇️ Scrolling down...')
         except:
             pass
         
@@ -326,19 +910,16 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
         steps = 15  # More steps for smoother scrolling
         for i in range(1, steps + 1):
             pos = int(current_position + (bottom_position - current_position) * i / steps)
-            driver.execute_script(f"window.scrollTo(0, {pos});")
+            driver.execute_script(_JS_SCROLL_TO, pos)
             time.sleep(delay * 2)  # Longer delay for more dramatic effect
         
         # Final scroll to bottom
-        driver.execute_script(f"window.scrollTo(0, {bottom_position});")
+        driver.execute_script(_JS_SCROLL_TO, bottom_position)
         time.sleep(0.5)
         
         # Remove the indicator
         try:
-            driver.execute_script("""
-                var indicator = document.getElementById('scroll-indicator');
-                if (indicator) document.body.removeChild(indicator);
-            """)
+            driver.execute_script(_JS_HIDE_INDICATOR)
         except:
             pass
         return
@@ -347,20 +928,7 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
     if direction == 'down':
         # Create a visual indicator for scrolling down
         try:
-            driver.execute_script("""
-                var indicator = document.createElement('div');
-                indicator.innerHTML = '⬇️ Scrolling...';
-                indicator.style.position = 'fixed';
-                indicator.style.right = '20px';
-                indicator.style.top = '20px';
-                indicator.style.backgroundColor = 'rgba(0,0,0,0.7)';
-                indicator.style.color = 'white';
-                indicator.style.padding = '8px 15px';
-                indicator.style.borderRadius = '4px';
-                indicator.style.zIndex = '9999';
-                indicator.id = 'scroll-indicator';
-                document.body.appendChild(indicator);
-            """)
+            driver.execute_script(_JS_SHOW_INDICATOR, '⬇️ Scrolling...')
         except:
             pass
             
@@ -374,20 +942,7 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
     elif direction == 'up':
         # Create a visual indicator for scrolling up
         try:
-            driver.execute_script("""
-                var indicator = document.createElement('div');
-                indicator.innerHTML = '⬆️ Scrolling...';
-                indicator.style.position = 'fixed';
-                indicator.style.right = '20px';
-                indicator.style.top = '20px';
-                indicator.style.backgroundColor = 'rgba(0,0,0,0.7)';
-                indicator.style.color = 'white';
-                indicator.style.padding = '8px 15px';
-                indicator.style.borderRadius = '4px';
-                indicator.style.zIndex = '9999';
-                indicator.id = 'scroll-indicator';
-                document.body.appendChild(indicator);
-            """)
+            driver.execute_script(_JS_SHOW_INDICATOR, '⬆️ Scrolling...')
         except:
             pass
             
@@ -401,19 +956,16 @@ def scroll_smoothly(driver, direction='down', speed='medium', distance=None):
     
     # Perform the smooth scroll using the calculated positions
     for pos in scroll_positions:
-        driver.execute_script(f"window.scrollTo(0, {pos});")
+        driver.execute_script(_JS_SCROLL_TO, pos)
         time.sleep(delay)
     
     # Final scroll to exact target position
-    driver.execute_script(f"window.scrollTo(0, {target});")
+    driver.execute_script(_JS_SCROLL_TO, target)
     time.sleep(0.5)  # Longer pause at destination for better visibility
     
     # Remove the indicator
     try:
-        driver.execute_script("""
-            var indicator = document.getElementById('scroll-indicator');
-            if (indicator) document.body.removeChild(indicator);
-        """)
+        driver.execute_script(_JS_HIDE_INDICATOR)
     except:
         pass
 
@@ -426,7 +978,12 @@ def highlight_element(driver, element, style="info", duration=0.7):
     - element: The element to highlight
     - style: "info", "success", "warning", or "error"
     - duration: How long to show the highlight in seconds
+    
+    Does nothing when VISUAL is off (DEMO_VISUAL=0).
     """
+    if not VISUAL:
+        return
+    
     styles = {
         "info": {"color": "#2196F3", "text": "Info"},
         "success": {"color": "#4CAF50", "text": "Success"},
@@ -445,39 +1002,159 @@ def highlight_element(driver, element, style="info", duration=0.7):
     time.sleep(0.5)
     
     # Apply pulsating highlight effect
-    driver.execute_script(f"""
-        var originalStyle = arguments[0].getAttribute('style') || '';
-        
-        // Add pulsating animation
-        var styleTag = document.createElement('style');
-        styleTag.id = 'highlight-animation';
-        styleTag.innerHTML = `
-            @keyframes highlight-pulse {{
-                0% {{ box-shadow: 0 0 0 0 {color}80; }}
-                70% {{ box-shadow: 0 0 0 10px {color}00; }}
-                100% {{ box-shadow: 0 0 0 0 {color}00; }}
-            }}
-        `;
-        document.head.appendChild(styleTag);
-        
-        arguments[0].style.boxShadow = '0 0 5px {color}';
-        arguments[0].style.border = '2px solid {color}';
-        arguments[0].style.transition = 'all 0.3s';
-        arguments[0].style.animation = 'highlight-pulse 1.5s infinite';
-        arguments[0].style.position = 'relative';
-        arguments[0].style.zIndex = '10';
-    """, element)
+    driver.execute_script(_JS_HIGHLIGHT_ON, element, color)
     
     # Pause to show the highlight
     time.sleep(duration)
     
     # Remove the animation and restore original style
-    driver.execute_script("""
-        var styleTag = document.getElementById('highlight-animation');
-        if (styleTag) document.head.removeChild(styleTag);
+    driver.execute_script(_JS_HIGHLIGHT_OFF, element, original_style)
+
+def upload_one(driver, idx, document):
+    """
+    Upload a single document through the web form
+    
+    Parameters:
+    - driver: A logged-in Selenium WebDriver instance
+    - idx: Position of the document in DEMO_DOCUMENTS (used for logs and screenshots)
+    - document: Dict with name, description, tags and path
+    """
+    print(f"\nUploading document {idx+1}/{len(DEMO_DOCUMENTS)}: {document['name']}")
+    print(f"📂 File: {document['path']}")
+    
+    # The working upload page URL is probed once and reused for every document
+    upload_url = resolve_upload_url()
+    driver.get(upload_url)
+    
+    print(f"📄 Upload page URL: {driver.current_url}")
+    take_screenshot(driver, f"upload_page_{idx+1}")
+    
+    # Debug the form structure to identify field names
+    debug_form_fields(driver)
+    
+    try:
+        # Check the form's action URL to see where it will submit to
+        try:
+            form_action = with_form(
+                driver, upload_url, lambda form: form.get_attribute("action")
+            ) or UPLOAD_ROUTES['upload_submit']
+            print(f"Form will submit to: {form_action}")
+        except:
+            print("Could not determine form action, will use default")
+            form_action = UPLOAD_ROUTES['upload_submit']
+        
+        # Discover all form fields in a single DOM scan
+        fields = LOCATOR_CACHE.resolve_fields(driver, upload_url, {
+            'name': PATTERNS['document_name'],
+            'desc': PATTERNS['document_description'],
+            'tags': PATTERNS['document_tags'],
+            'file': PATTERNS['file_input'],
+            'submit': PATTERNS['upload_submit']
+        }, visible=('submit',))
+        
+        name_input = fields['name']
+        if name_input:
+            print("Found document name input")
+            highlight_element(driver, name_input, "info", 0.7)
+            type_naturally(name_input, document["name"], 'fast')
+        else:
+            print("⚠️ Could not find document name field. Using JavaScript fallback.")
+            # Try JavaScript as last resort
+            driver.execute_script(
+                'Array.from(document.querySelectorAll("input[type=\'text\']")).filter(i => !i.value)[0].value = arguments[0]', 
+                document["name"]
+            )
+        
+        desc_input = fields['desc']
+        if desc_input:
+            print("Found description input")
+            highlight_element(driver, desc_input, "info", 0.7)
+            type_naturally(desc_input, document["description"], 'fast')
+        
+        tags_input = fields['tags']
+        if tags_input:
+            print("Found tags input")
+            highlight_element(driver, tags_input, "info", 0.7)
+            type_naturally(tags_input, document["tags"], 'fast')
+        
+        # Upload file
+        file_input = fields['file']
+        if file_input:
+            set_file_input(driver, file_input, document["path"])
+            print(f"Selected file: {document['path']}")
+        else:
+            print("⚠️ Could not find file input field")
+            return
+        
+        # Submit the form - fall back to waiting in case the button renders late
+        print("Submitting upload form...")
+        form_submitted = False
+        old_page = driver.find_element(By.TAG_NAME, "html")
+        button = fields['submit'] or LOCATOR_CACHE.wait(
+            driver, upload_url, 'submit', PATTERNS['upload_submit']
+        )
+        if button:
+            try:
+                highlight_element(driver, button, "success", 0.7)
+                button.click()
+                form_submitted = True
+                print("Clicked submit button")
+            except Exception as e:
+                print(f"Submit button not clickable: {e}")
+        else:
+            print("Submit button not found")
         
-        arguments[0].setAttribute('style', arguments[1]);
-    """, element, original_style)
+        if not form_submitted:
+            # Try submitting the form directly as a last resort
+            try:
+                print("Attempting direct form submission...")
+                form_submitted = bool(with_form(
+                    driver, upload_url,
+                    lambda form: driver.execute_script("arguments[0].submit(); return true;", form)
+                ))
+                print("Submitted form using JavaScript" if form_submitted else "No form found to submit")
+            except Exception as e:
+                print(f"Could not submit form: {e}")
+        
+        # Wait for the upload to complete: the POST either redirects away from
+        # the form page or back to it with an error, and the result is flashed
+        # as an alert either way
+        if form_submitted and wait_for_page_replaced(driver, old_page, timeout=UPLOAD_TIMEOUT):
+            wait_for_readystate(driver)
+        wait_for_alert(driver, timeout=3)
+        take_screenshot(driver, f"after_upload_{idx+1}")
+        
+        # Check if we were redirected back to the upload page or to an error page
+        current_url = driver.current_url
+        print(f"Current URL after upload: {current_url}")
+        
+        # Check for success message or errors
+        try:
+            # Cheap existence probe first; most uploads redirect to a page without alerts
+            has_alert = driver.execute_script("return !!document.querySelector(arguments[0]);", ALERT_CSS)
+            alerts = driver.find_elements(By.CSS_SELECTOR, ALERT_CSS) if has_alert else []
+            if alerts:
+                for alert, props in zip(alerts, element_props(driver, alerts)):
+                    alert_text = props['text']
+                    alert_class = props['cls']
+                    print(f"Alert found: [{alert_class}] {alert_text}")
+                    
+                    if "success" in alert_class.lower() and "upload" in alert_text.lower():
+                        print(f"✅ Document '{document['name']}' uploaded successfully")
+                        highlight_element(driver, alert, "success", 0.7)
+                    elif "error" in alert_class.lower() or "danger" in alert_class.lower():
+                        print(f"❌ Upload error: {alert_text}")
+                        highlight_element(driver, alert, "error", 0.7)
+                        # If there was an error, continue to next document
+                        continue
+            else:
+                print("No alert messages found")
+        except:
+            print("No alert messages found")
+    
+    except Exception as upload_error:
+        print(f"⚠️ Error uploading document {idx+1}: {str(upload_error)}")
+        take_screenshot(driver, f"upload_error_{idx+1}")
 
 def main():
     # Check prerequisites
@@ -494,6 +1171,7 @@ def main():
             return False
     else:
         print("✅ Flask application is running and accessible")
+        warm_up_server()
     
     ganache_running = is_ganache_running()
     if not ganache_running:
@@ -515,27 +1193,20 @@ def main():
     
     # Ensure browser is in full screen mode with multiple approaches for reliability
     try:
-        time.sleep(1)  # Wait for browser to initialize
+        # Wait for the initial page to finish loading instead of a fixed sleep
+        driver.execute_cdp_cmd('Page.enable', {})
+        wait_for_readystate(driver, timeout=3)
         driver.maximize_window()  # First maximize
         driver.fullscreen_window()  # Then enter true fullscreen mode
         
         # Also try JavaScript fullscreen API as a backup method
-        driver.execute_script("""
-            if (document.documentElement.requestFullscreen) {
-                document.documentElement.requestFullscreen();
-            } else if (document.documentElement.mozRequestFullscreen) {
-                document.documentElement.mozRequestFullscreen();
-            } else if (document.documentElement.webkitRequestFullscreen) {
-                document.documentElement.webkitRequestFullscreen();
-            } else if (document.documentElement.msRequestFullscreen) {
-                document.documentElement.msRequestFullscreen();
-            }
-        """)
+        driver.execute_script(_JS_FULLSCREEN)
     except Exception as e:
         print(f"Note: Could not force fullscreen: {e}")
     
-    # Set implicit wait time after browser is configured
-    driver.implicitly_wait(5)
+    # No implicit wait: lookups that miss return immediately; anything that
+    # races a page load waits explicitly
+    driver.implicitly_wait(0)
     
     document_ids = []  # Store uploaded document IDs
     goto_step_3 = False
@@ -553,23 +1224,15 @@ def main():
         
         # Try to find the necessary input fields
         try:
-            # Find name input - try multiple selectors
-            name_selectors = [
-                (By.NAME, "name"),
-                (By.ID, "name"),
-                (By.NAME, "fullname"),
-                (By.ID, "fullname"),
-                (By.CSS_SELECTOR, "input[placeholder*='name' i]")
-            ]
-            
+            # Find name input - all candidate selectors in one CSS union
             name_input = None
-            for selector in name_selectors:
-                try:
-                    name_input = driver.find_element(*selector)
-                    print(f"Found name input using selector: {selector}")
-                    break
-                except:
-                    pass
+            try:
+                name_input = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, NAME_CSS))
+                )
+                print("Found name input")
+            except TimeoutException:
+                pass
                     
             if name_input:
                 highlight_element(driver, name_input, "info", 0.7)
@@ -578,22 +1241,15 @@ def main():
             else:
                 print("⚠️ Could not find name input field")
             
-            # Find email input - try multiple selectors
-            email_selectors = [
-                (By.NAME, "email"),
-                (By.ID, "email"),
-                (By.CSS_SELECTOR, "input[type='email']"),
-                (By.CSS_SELECTOR, "input[placeholder*='email' i]")
-            ]
-            
+            # Find email input - all candidate selectors in one CSS union
             email_input = None
-            for selector in email_selectors:
-                try:
-                    email_input = driver.find_element(*selector)
-                    print(f"Found email input using selector: {selector}")
-                    break
-                except:
-                    pass
+            try:
+                email_input = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, EMAIL_CSS))
+                )
+                print("Found email input")
+            except TimeoutException:
+                pass
                     
             if email_input:
                 highlight_element(driver, email_input, "info", 0.7)
@@ -602,22 +1258,10 @@ def main():
             else:
                 print("⚠️ Could not find email input field")
             
-            # Find password input - try multiple selectors
-            password_selectors = [
-                (By.NAME, "password"),
-                (By.ID, "password"),
-                (By.CSS_SELECTOR, "input[type='password']")
-            ]
-            
-            password_inputs = []
-            for selector in password_selectors:
-                try:
-                    inputs = driver.find_elements(*selector)
-                    if inputs:
-                        password_inputs.extend(inputs)
-                        print(f"Found {len(inputs)} password input(s) using selector: {selector}")
-                except:
-                    pass
+            # Find password input(s) - the union matches each field only once
+            password_inputs = driver.find_elements(By.CSS_SELECTOR, PASSWORD_CSS)
+            if password_inputs:
+                print(f"Found {len(password_inputs)} password input(s)")
             
             # Handle password fields (typically 1 or 2 password fields)
             if len(password_inputs) >= 1:
@@ -633,39 +1277,38 @@ def main():
             else:
                 print("⚠️ Could not find password input field(s)")
                 
-            # Try to find the signup button and click it
-            signup_button_selectors = [
-                (By.XPATH, "//button[contains(text(), 'Sign Up') or contains(text(), 'Signup') or contains(text(), 'Register')]"),
-                (By.XPATH, "//input[@type='submit']"),
-                (By.CSS_SELECTOR, "form button[type='submit']"),
-                (By.CSS_SELECTOR, "button.btn-primary")
-            ]
-            
+            # Try to find the signup button and click it (all candidates are
+            # probed inside the browser in a single round-trip)
             signup_clicked = False
-            for selector in signup_button_selectors:
+            old_url = driver.current_url
+            button = driver.execute_script(_JS_FIND_SIGNUP_BUTTON)
+            if button:
                 try:
-                    button = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable(selector)
-                    )
                     highlight_element(driver, button, "success", 0.7)
                     button.click()
                     signup_clicked = True
-                    print(f"Clicked signup button with selector: {selector}")
-                    break
-                except:
-                    print(f"Could not find signup button with selector: {selector}")
+                    print("Clicked signup button")
+                except Exception as e:
+                    print(f"Could not click signup button: {e}")
+            else:
+                print("Could not find signup button")
             
             if not signup_clicked:
                 # Try submitting the form directly
                 try:
-                    form = driver.find_element(By.TAG_NAME, "form")
-                    driver.execute_script("arguments[0].submit();", form)
-                    signup_clicked = True
-                    print("Submitted signup form using JavaScript")
+                    signup_clicked = bool(with_form(
+                        driver, AUTH_ROUTES['signup'],
+                        lambda form: driver.execute_script("arguments[0].submit(); return true;", form)
+                    ))
+                    print("Submitted signup form using JavaScript" if signup_clicked else "Could not submit signup form")
                 except:
                     print("Could not submit signup form")
             
-            time.sleep(3)
+            # Wait for the post-signup redirect rather than a fixed pause
+            if wait_for_url_change(driver, old_url, timeout=10):
+                wait_for_readystate(driver)
+            else:
+                print("⚠️ Page did not change after signup submission")
             take_screenshot(driver, "after_signup")
             print(f"✅ Account creation attempt completed with email: {DEMO_EMAIL}")
             
@@ -693,23 +1336,15 @@ def main():
             # Debug form fields for login page
             debug_form_fields(driver)
             
-            # Try multiple selectors for email input
-            email_selectors = [
-                (By.NAME, "email"),
-                (By.ID, "email"),
-                (By.CSS_SELECTOR, "input[type='email']"),
-                (By.CSS_SELECTOR, "input[placeholder*='email' i]")
-            ]
-            
             # Try to find and fill email field
             email_input = None
-            for selector in email_selectors:
-                try:
-                    email_input = driver.find_element(*selector)
-                    print(f"Found email input with selector: {selector}")
-                    break
-                except:
-                    pass
+            try:
+                email_input = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, EMAIL_CSS))
+                )
+                print("Found email input")
+            except TimeoutException:
+                pass
                     
             if email_input:
                 highlight_element(driver, email_input, "info", 0.7)
@@ -717,22 +1352,15 @@ def main():
             else:
                 print("⚠️ Could not find email input field on login page")
             
-            # Try multiple selectors for password input
-            password_selectors = [
-                (By.NAME, "password"),
-                (By.ID, "password"),
-                (By.CSS_SELECTOR, "input[type='password']")
-            ]
-            
             # Try to find and fill password field
             password_input = None
-            for selector in password_selectors:
-                try:
-                    password_input = driver.find_element(*selector)
-                    print(f"Found password input with selector: {selector}")
-                    break
-                except:
-                    pass
+            try:
+                password_input = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, PASSWORD_CSS))
+                )
+                print("Found password input")
+            except TimeoutException:
+                pass
                     
             if password_input:
                 highlight_element(driver, password_input, "info", 0.7)
@@ -741,39 +1369,33 @@ def main():
                 print("⚠️ Could not find password input field on login page")
             
             # Try to find login button and click it
-            login_button_selectors = [
-                (By.XPATH, "//button[contains(text(), 'Login') or contains(text(), 'Sign In')]"),
-                (By.XPATH, "//button[contains(@type, 'submit')]"),
-                (By.XPATH, "//input[contains(@type, 'submit')]"),
-                (By.CSS_SELECTOR, "button.btn-primary"),
-                (By.CSS_SELECTOR, "form button")
-            ]
-            
             login_clicked = False
-            for selector in login_button_selectors:
+            old_url = driver.current_url
+            button = LOCATOR_CACHE.wait(driver, AUTH_ROUTES['login'], 'login_button', PATTERNS['login_button'])
+            if button:
                 try:
-                    button = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable(selector)
-                    )
                     highlight_element(driver, button, "success", 0.7)
                     button.click()
                     login_clicked = True
-                    print(f"Clicked login button with selector: {selector}")
-                    break
-                except:
-                    print(f"Login button not found or not clickable with selector: {selector}")
+                    print("Clicked login button")
+                except Exception as e:
+                    print(f"Login button not clickable: {e}")
+            else:
+                print("Login button not found")
             
             if not login_clicked:
                 # Try submitting the form directly
                 try:
-                    form = driver.find_element(By.TAG_NAME, "form")
-                    driver.execute_script("arguments[0].submit();", form)
-                    login_clicked = True
-                    print("Submitted login form using JavaScript")
+                    login_clicked = bool(with_form(
+                        driver, AUTH_ROUTES['login'],
+                        lambda form: driver.execute_script("arguments[0].submit(); return true;", form)
+                    ))
+                    print("Submitted login form using JavaScript" if login_clicked else "Could not submit login form")
                 except:
                     print("Could not submit login form")
             
-            time.sleep(3)
+            if wait_for_url_change(driver, old_url):
+                wait_for_readystate(driver)
             take_screenshot(driver, "after_login")
             
             # Verify if we're on dashboard
@@ -787,217 +1409,22 @@ def main():
         # STEP 3: Upload multiple documents
         print("\n📄 STEP 3: Uploading documents...")
         
+        # Sequential on purpose: every upload rebuilds the backend's shared
+        # Merkle tree and sends an on-chain transaction, which must not overlap
         for idx, document in enumerate(DEMO_DOCUMENTS):
-            print(f"\nUploading document {idx+1}/{len(DEMO_DOCUMENTS)}: {document['name']}")
-            print(f"📂 File: {document['path']}")
-            
-            # Try primary upload page URL first
-            driver.get(USER_ROUTES['upload_page'])
-            current_url = driver.current_url
-            time.sleep(2)  # Give time to load
-            
-            # If first URL gives 404, try alternative route (direct without user prefix)
-            if "404" in driver.title or "not found" in driver.title.lower():
-                fallback_url = f"{BASE_URL}/upload-document"
-                print(f"⚠️ Primary upload URL failed, trying fallback URL: {fallback_url}")
-                driver.get(fallback_url)
-                time.sleep(2)
-            
-            print(f"📄 Upload page URL: {driver.current_url}")
-            take_screenshot(driver, f"upload_page_{idx+1}")
-            
-            # Debug the form structure to identify field names
-            debug_form_fields(driver)
-            
-            try:
-                # Check the form's action URL to see where it will submit to
-                try:
-                    form = driver.find_element(By.TAG_NAME, "form")
-                    form_action = form.get_attribute("action") or UPLOAD_ROUTES['upload_submit']
-                    print(f"Form will submit to: {form_action}")
-                except:
-                    print("Could not determine form action, will use default")
-                    form_action = UPLOAD_ROUTES['upload_submit']
-                
-                # Try to find document name field with multiple selectors
-                name_input = None
-                name_selectors = [
-                    (By.NAME, "document_name"),
-                    (By.ID, "document_name"),
-                    (By.CSS_SELECTOR, "input[placeholder*='name' i]"),
-                    (By.CSS_SELECTOR, "input[type='text']"),
-                ]
-                
-                for selector in name_selectors:
-                    try:
-                        name_input = WebDriverWait(driver, 3).until(
-                            EC.presence_of_element_located(selector)
-                        )
-                        if name_input:
-                            print(f"Found document name input with selector: {selector}")
-                            highlight_element(driver, name_input, "info", 0.7)
-                            type_naturally(name_input, document["name"], 'fast')
-                            break
-                    except:
-                        continue
-                
-                if not name_input:
-                    print("⚠️ Could not find document name field. Using JavaScript fallback.")
-                    # Try JavaScript as last resort
-                    driver.execute_script(
-                        'Array.from(document.querySelectorAll("input[type=\'text\']")).filter(i => !i.value)[0].value = arguments[0]', 
-                        document["name"]
-                    )
-                
-                # Try to find description field with multiple selectors
-                desc_input = None
-                desc_selectors = [
-                    (By.NAME, "document_description"),
-                    (By.ID, "document_description"),
-                    (By.TAG_NAME, "textarea"),
-                    (By.CSS_SELECTOR, "textarea"),
-                ]
-                
-                for selector in desc_selectors:
-                    try:
-                        desc_input = WebDriverWait(driver, 2).until(
-                            EC.presence_of_element_located(selector)
-                        )
-                        if desc_input:
-                            print(f"Found description input with selector: {selector}")
-                            highlight_element(driver, desc_input, "info", 0.7)
-                            type_naturally(desc_input, document["description"], 'fast')
-                            break
-                    except:
-                        continue
-                
-                # Try to find tags field with multiple selectors
-                tags_input = None
-                tags_selectors = [
-                    (By.NAME, "tags"),
-                    (By.ID, "tags"),
-                    (By.CSS_SELECTOR, "input[placeholder*='tag' i]"),
-                ]
-                
-                for selector in tags_selectors:
-                    try:
-                        tags_input = WebDriverWait(driver, 2).until(
-                            EC.presence_of_element_located(selector)
-                        )
-                        if tags_input:
-                            print(f"Found tags input with selector: {selector}")
-                            highlight_element(driver, tags_input, "info", 0.7)
-                            type_naturally(tags_input, document["tags"], 'fast')
-                            break
-                    except:
-                        continue
-            
-                # Upload file - try different selectors
-                file_input = None
-                file_selectors = [
-                    (By.NAME, "file"),
-                    (By.ID, "file"),
-                    (By.CSS_SELECTOR, "input[type='file']"),
-                    (By.XPATH, "//input[@type='file']")
-                ]
-                
-                for selector in file_selectors:
-                    try:
-                        file_input = driver.find_element(*selector)
-                        print(f"Found file input with selector: {selector}")
-                        break
-                    except:
-                        continue
-                        
-                if file_input:
-                    file_input.send_keys(document["path"])
-                    print(f"Selected file: {document['path']}")
-                else:
-                    print("⚠️ Could not find file input field")
-                    continue
-                
-                # Submit the form - try multiple approaches
-                print("Submitting upload form...")
-                submit_selectors = [
-                    (By.XPATH, "//button[contains(text(), 'Upload')]"),
-                    (By.XPATH, "//button[contains(text(), 'Submit')]"),
-                    (By.XPATH, "//button[@type='submit']"),
-                    (By.CSS_SELECTOR, "form button[type='submit']"),
-                    (By.CSS_SELECTOR, "button.btn-primary"),
-                    (By.CSS_SELECTOR, "form button")
-                ]
-                
-                form_submitted = False
-                for selector in submit_selectors:
-                    try:
-                        button = WebDriverWait(driver, 3).until(
-                            EC.element_to_be_clickable(selector)
-                        )
-                        highlight_element(driver, button, "success", 0.7)
-                        button.click()
-                        form_submitted = True
-                        print(f"Clicked submit button with selector: {selector}")
-                        break
-                    except Exception as e:
-                        print(f"Submit button not found or not clickable with selector: {selector}")
-                
-                if not form_submitted:
-                    # Try submitting the form directly as a last resort
-                    try:
-                        form = driver.find_element(By.TAG_NAME, "form")
-                        print("Found form, attempting direct submission...")
-                        driver.execute_script("arguments[0].submit();", form)
-                        form_submitted = True
-                        print("Submitted form using JavaScript")
-                    except Exception as e:
-                        print(f"Could not submit form: {e}")
-                
-                # Wait longer for upload to complete
-                time.sleep(8)
-                take_screenshot(driver, f"after_upload_{idx+1}")
-                
-                # Check if we were redirected back to the upload page or to an error page
-                current_url = driver.current_url
-                print(f"Current URL after upload: {current_url}")
-                
-                # Check for success message or errors
-                try:
-                    alerts = driver.find_elements(By.CSS_SELECTOR, ".alert, .flash-message, .notification")
-                    if alerts:
-                        for alert in alerts:
-                            alert_text = alert.text
-                            alert_class = alert.get_attribute("class")
-                            print(f"Alert found: [{alert_class}] {alert_text}")
-                            
-                            if "success" in alert_class.lower() and "upload" in alert_text.lower():
-                                print(f"✅ Document '{document['name']}' uploaded successfully")
-                                highlight_element(driver, alert, "success", 0.7)
-                            elif "error" in alert_class.lower() or "danger" in alert_class.lower():
-                                print(f"❌ Upload error: {alert_text}")
-                                highlight_element(driver, alert, "error", 0.7)
-                                # If there was an error, continue to next document
-                                continue
-                except:
-                    print("No alert messages found")
-                    
-            except Exception as upload_error:
-                print(f"⚠️ Error uploading document {idx+1}: {str(upload_error)}")
-                take_screenshot(driver, f"upload_error_{idx+1}")
-                continue  # Try the next document even if this one failed
+            upload_one(driver, idx, document)
                 
         # STEP 4: Go to all documents page
         print("\n📚 STEP 4: Viewing all documents...")
         
         # First try the route with view prefix (based on blueprint registration)
-        driver.get(VIEW_ROUTES['all_documents'])
-        time.sleep(2)  # Reduced wait time
+        title, _ = nav_and_probe(driver, VIEW_ROUTES['all_documents'])
         
         # If URL redirected or page not found, try alternate URL
-        if "404" in driver.title or "not found" in driver.title.lower():
+        if "404" in title or "not found" in title.lower():
             fallback_url = VIEW_ROUTES['documents_alt']
             print(f"⚠️ Primary URL failed. Trying fallback URL: {fallback_url}")
-            driver.get(fallback_url)
-            time.sleep(2)  # Reduced wait time
+            nav_and_probe(driver, fallback_url)
             
         print(f"📚 On documents page: {driver.current_url}")
         take_screenshot(driver, "all_documents")
@@ -1006,28 +1433,11 @@ def main():
         print("\n🔎 Searching for documents with keyword: 'blockchain'")
         
         # Look for search input with multiple selectors
-        search_selectors = [
-            (By.ID, "keyword-search"),
-            (By.NAME, "keyword"),
-            (By.NAME, "search"),
-            (By.CSS_SELECTOR, "input[placeholder*='search' i]"),
-            (By.CSS_SELECTOR, "input[placeholder*='keyword' i]"),
-            (By.CSS_SELECTOR, "input[type='text']")
-        ]
-        
-        search_input = None
-        for selector in search_selectors:
-            try:
-                elements = driver.find_elements(*selector)
-                for elem in elements:
-                    if elem.is_displayed():
-                        search_input = elem
-                        print(f"Found search input with selector: {selector}")
-                        break
-                if search_input:
-                    break
-            except:
-                continue
+        search_input = LOCATOR_CACHE.resolve(
+            driver, VIEW_ROUTES['all_documents'], 'search_input', PATTERNS['search_input'], visible=True
+        )
+        if search_input:
+            print("Found search input")
         
         if search_input:
             # Highlight and fill search field
@@ -1037,25 +1447,10 @@ def main():
             
             # Find and click search button or press Enter
             search_button = None
-            search_button_selectors = [
-                (By.XPATH, "//button[contains(text(), 'Search')]"),
-                (By.CSS_SELECTOR, "button.search-button"),
-                (By.CSS_SELECTOR, "button[type='submit']"),
-                (By.XPATH, "//button[contains(@class, 'search')]"),
-                (By.XPATH, "//i[contains(@class, 'fa-search')]/parent::button")
-            ]
-            
-            for selector in search_button_selectors:
-                try:
-                    buttons = driver.find_elements(*selector)
-                    for btn in buttons:
-                        if btn.is_displayed():
-                            search_button = btn
-                            break
-                    if search_button:
-                        break
-                except:
-                    continue
+            search_button = LOCATOR_CACHE.wait(
+                driver, VIEW_ROUTES['all_documents'], 'search_button', PATTERNS['search_button'], timeout=2
+            )
+            old_url = driver.current_url
             
             if search_button:
                 highlight_element(driver, search_button, "success", 0.5)
@@ -1067,8 +1462,9 @@ def main():
                 from selenium.webdriver.common.keys import Keys
                 search_input.send_keys(Keys.ENTER)
             
-            # Wait for search results
-            time.sleep(1.5)
+            # Wait for search results (the search form submits via GET)
+            if wait_for_url_change(driver, old_url, timeout=5):
+                wait_for_readystate(driver)
             take_screenshot(driver, "search_results")
             print("✅ Search completed. Showing documents with 'blockchain' keyword.")
         else:
@@ -1088,162 +1484,107 @@ def main():
                 if len(cards) > 0:
                     highlight_element(driver, cards[0], "info", 0.5)
                 
-                for card in cards[:3]:
-                    try:
-                        view_button_selectors = [
-                            ".//a[contains(text(), 'View') and not(contains(text(), 'Open'))]",
-                            ".//button[contains(text(), 'View') and not(contains(text(), 'Open'))]",
-                            ".//a[contains(@class, 'btn')][contains(text(), 'View')]",
-                            ".//a[contains(@href, 'view/document') or contains(@href, 'document/')]"
-                        ]
-                        
-                        for selector in view_button_selectors:
-                            buttons = card.find_elements(By.XPATH, selector)
-                            for button in buttons:
-                                if button.is_displayed():
-                                    view_buttons.append(button)
-                                    print(f"Found View button with text: '{button.text}'")
-                                    highlight_element(driver, button, "success", 0.5)
-                                    break
-                            if view_buttons:
-                                break
-                    except Exception as e:
-                        print(f"Error finding view button: {e}")
+                try:
+                    candidates = driver.find_elements(By.XPATH, VIEW_BUTTONS_XPATH)
+                    view_buttons = [
+                        (button, props) for button, props in zip(candidates, element_props(driver, candidates))
+                        if props['visible']
+                    ]
+                    if view_buttons:
+                        print(f"Found View button with text: '{view_buttons[0][1]['text']}'")
+                        highlight_element(driver, view_buttons[0][0], "success", 0.5)
+                except Exception as e:
+                    print(f"Error finding view button: {e}")
                 
                 if view_buttons:
                     print(f"Found {len(view_buttons)} 'View' buttons (excluding 'Open' buttons)")
-                    view_url = view_buttons[0].get_attribute('href')
+                    view_url = view_buttons[0][1]['href']
                     print(f"Navigating to document details view: {view_url}")
                     
                     # Navigate to document details
                     driver.get(view_url)
-                    time.sleep(1.5)
+                    wait_for_readystate(driver)
                     take_screenshot(driver, "document_detail_view")
                     
                     # Extract document ID for later
                     document_id = None
                     try:
-                        # Try different selectors for document ID
-                        id_selectors = [
-                            ".document-id", 
-                            "[data-document-id]", 
-                            ".meta-value"
-                        ]
-                        for selector in id_selectors:
-                            elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                            for elem in elements:
-                                text = elem.text.strip()
-                                if "-" in text and len(text) > 8:
-                                    document_id = text
-                                    print(f"Found document ID: {document_id}")
-                                    break
-                            if document_id:
-                                break
-                        
-                        # Extract from URL if not found elsewhere
-                        if not document_id and "/document/" in driver.current_url:
-                            parts = driver.current_url.split("/document/")
-                            if len(parts) > 1:
-                                document_id = parts[1].split("/")[0].strip()
-                                print(f"Extracted document ID from URL: {document_id}")
+                        # Check the URL and the ID elements in a single browser call
+                        document_id = driver.execute_script(
+                            _JS_FIND_DOCUMENT_ID, ", ".join(value for _, value in PATTERNS['document_id'])
+                        )
+                        if document_id:
+                            print(f"Found document ID: {document_id}")
                     except Exception as e:
                         print(f"Error extracting document ID: {e}")
                     
-                    # Scroll down to view document content
-                    print("Scrolling down to view document content...")
-                    scroll_smoothly(driver, 'down', 'fast')
-                    time.sleep(0.5)
-                    
-                    # Scroll back up to find verification options
-                    print("Scrolling up to find verification options...")
-                    scroll_smoothly(driver, 'top', 'fast')
-                    time.sleep(0.5)
-                    
-                    # Look for verify button
-                    verify_selectors = [
-                        "//a[contains(text(), 'Verify')]",
-                        "//button[contains(text(), 'Verify')]",
-                        "//a[contains(@href, 'verif')]",
-                        "//a[contains(@class, 'verify')]"
-                    ]
-                    
-                    verify_element = None
-                    for selector in verify_selectors:
-                        try:
-                            elements = driver.find_elements(By.XPATH, selector)
-                            for elem in elements:
-                                if elem.is_displayed():
-                                    verify_element = elem
-                                    print(f"Found verify button: {elem.text}")
-                                    break
-                            if verify_element:
-                                break
-                        except:
-                            continue
+                    # Look for verify button and scroll straight to it
+                    verify_element = LOCATOR_CACHE.resolve(
+                        driver, VIEW_ROUTES['document_details'], 'verify_link', PATTERNS['verify_link'], visible=True
+                    )
+                    if verify_element:
+                        verify_props = element_props(driver, [verify_element])[0]
+                        print(f"Found verify button: {verify_props['text']}")
+                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", verify_element)
                     
                     if verify_element:
                         # Highlight and click the verification link
                         highlight_element(driver, verify_element, "success", 0.5)
-                        verify_url = verify_element.get_attribute('href')
+                        verify_url = verify_props['href']
                         if verify_url:
                             driver.get(verify_url)
                         else:
+                            old_url = driver.current_url
                             verify_element.click()
-                        
-                        time.sleep(1.5)
+                            wait_for_url_change(driver, old_url, timeout=5)
+                        wait_for_readystate(driver)
                         take_screenshot(driver, "verification_page")
                         
                         # Find and click verify document button on verification page
-                        verify_document_selectors = [
-                            "//button[contains(text(), 'Verify')]",
-                            "//button[@id='verify-btn']",
-                            "//button[contains(@class, 'primary')]"
-                        ]
-                        
-                        for selector in verify_document_selectors:
+                        # (text filter runs in the browser, no per-poll XPath evaluation)
+                        try:
+                            verify_btn = WebDriverWait(driver, 5, poll_frequency=0.25).until(
+                                lambda d: d.execute_script(_JS_FIND_VERIFY_BUTTON)
+                            )
+                        except TimeoutException:
+                            verify_btn = None
+                        if verify_btn:
                             try:
-                                verify_btn = WebDriverWait(driver, 2).until(
-                                    EC.element_to_be_clickable((By.XPATH, selector))
-                                )
                                 highlight_element(driver, verify_btn, "success", 0.5)
                                 verify_btn.click()
                                 print("Clicked verify document button")
-                                break
-                            except:
-                                continue
+                            except Exception as e:
+                                print(f"Could not click verify document button: {e}")
                         
-                        # Wait for verification results
-                        time.sleep(3)
+                        # Wait for the verification request to render its result
+                        try:
+                            WebDriverWait(driver, 10).until(lambda d: d.execute_script(
+                                "var el = document.querySelector('.verification-results .result-title');"
+                                "return !!(el && el.textContent.trim());"
+                            ))
+                        except TimeoutException:
+                            print("⚠️ Verification result did not appear in time")
                         take_screenshot(driver, "verification_results")
                         
                         # Scroll down slightly to show full results
                         scroll_smoothly(driver, 'down', 'fast', 200)
-                        time.sleep(2)
                         take_screenshot(driver, "verification_results_scrolled")
                         
                         # STEP 6: Logout
                         print("\n🚪 STEP 6: Logging out...")
                         
                         # Find logout button in navbar
-                        logout_selectors = [
-                            "//a[contains(text(), 'Logout')]",
-                            "//button[contains(text(), 'Logout')]",
-                            "//a[contains(@href, 'logout')]",
-                            "//a[contains(text(), 'Sign Out')]"
-                        ]
-                        
-                        for selector in logout_selectors:
-                            try:
-                                logout_btn = driver.find_element(By.XPATH, selector)
-                                if logout_btn.is_displayed():
-                                    highlight_element(driver, logout_btn, "warning", 0.5)
-                                    logout_btn.click()
-                                    print("Clicked logout button")
-                                    time.sleep(1)
-                                    take_screenshot(driver, "after_logout")
-                                    break
-                            except:
-                                continue
+                        logout_btn = LOCATOR_CACHE.resolve(
+                            driver, 'navbar', 'logout', PATTERNS['logout'], visible=True
+                        )
+                        if logout_btn:
+                            highlight_element(driver, logout_btn, "warning", 0.5)
+                            old_url = driver.current_url
+                            logout_btn.click()
+                            print("Clicked logout button")
+                            if wait_for_url_change(driver, old_url, timeout=5):
+                                wait_for_readystate(driver)
+                            take_screenshot(driver, "after_logout")
                     else:
                         print("⚠️ Could not find verification button")
                 else:
@@ -1267,6 +1608,9 @@ def main():
         time.sleep(5)
         driver.quit()
         
+        # Make sure every queued screenshot has reached disk before reporting
+        flush_screenshots()
+        
         print("\n📋 Demo Summary:")
         print(f"- Account created: {DEMO_EMAIL}")
         print(f"- Documents uploaded: {len(DEMO_DOCUMENTS)}")
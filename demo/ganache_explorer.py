@@ -1,106 +1,165 @@
 import json
 import time
 import os
-import webbrowser
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from _screenshots import SCREENSHOTS_DIR, take_screenshot, flush_screenshots
 
 # Configuration
 GANACHE_URL = "http://localhost:7545"  # Default Ganache URL
 CONTRACT_ADDRESS = None  # Will be read from blockchain_logger config
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Backend", "blockchain", "config.json")
+GANACHE_UI = os.environ.get("GANACHE_UI") == "1"  # Also walk through the Ganache UI in Chrome
+RECENT_BLOCKS = 20  # How many of the latest blocks to summarize
+RPC_WORKERS = 8  # Concurrent JSON-RPC requests when fetching blocks and receipts
+CONTRACT_EVENTS = ("DocumentAction", "MerkleRootUpdated")
+NONINTERACTIVE = os.environ.get("NONINTERACTIVE") == "1"  # Answer prompts automatically (CI)
 
-def take_screenshot(driver, name):
-    """Take a screenshot and save it with a timestamp"""
-    screenshots_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshots")
-    os.makedirs(screenshots_dir, exist_ok=True)
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
-    filename = f"{screenshots_dir}/{timestamp}_{name}.png"
-    driver.save_screenshot(filename)
-    print(f"Screenshot saved: {filename}")
-    return filename
+# Visible <div>s with a direct text node containing any of arguments[0]; the
+# CSS pre-filter plus a text scan replaces XPath contains(text(), ...)
+_JS_DIVS_WITH_TEXT = """
+    var labels = arguments[0];
+    return Array.from(document.querySelectorAll('div')).filter(function(el) {
+        if (!el.getClientRects().length) return false;
+        return Array.from(el.childNodes).some(function(node) {
+            return node.nodeType === Node.TEXT_NODE && labels.some(function(label) {
+                return node.nodeValue.indexOf(label) > -1;
+            });
+        });
+    });
+"""
 
-def get_contract_address():
-    """Get the contract address from the blockchain_logger config file"""
+# True when the browser shows its own error page instead of the Ganache UI;
+# evaluated in the page so only a boolean crosses the wire
+_JS_UI_UNAVAILABLE = """
+    var body = document.body;
+    if (!body) return true;
+    if (body.classList.contains('neterror')) return true;
+    return /refused to connect|cannot display this webpage/i.test(body.innerText);
+"""
+
+def find_divs_with_text(driver, *labels):
+    """Return the visible divs whose own text contains any of the labels"""
+    return driver.execute_script(_JS_DIVS_WITH_TEXT, list(labels))
+
+def wait_for_div_with_text(driver, *labels, timeout=10):
+    """Wait for the first visible div whose own text contains any of the labels"""
+    from selenium.webdriver.support.ui import WebDriverWait
+    return WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: (find_divs_with_text(d, *labels) or [False])[0]
+    )
+
+def wait_for_route_change(driver, old_url, timeout=5):
+    """Wait for the Ganache UI to navigate away from old_url; returns False on timeout"""
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
     try:
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                                  "Backend", "blockchain", "config.json")
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-            return config.get('contract_address')
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(EC.url_changes(old_url))
+        return True
+    except TimeoutException:
+        return False
+
+@functools.lru_cache(maxsize=1)
+def load_config():
+    """Read the blockchain_logger config file (once per process)"""
+    try:
+        with open(CONFIG_PATH, 'r') as f:
+            return json.load(f)
     except Exception as e:
-        print(f"Error reading contract address: {e}")
-        return None
+        print(f"Error reading blockchain config: {e}")
+        return {}
 
-def main():
-    # Get the contract address
-    contract_address = get_contract_address()
-    if not contract_address:
-        print("Contract address not found. Using demo mode.")
-        contract_address = "0x0000000000000000000000000000000000000000"  # Placeholder
+def get_contract_address():
+    """Get the contract address from the blockchain_logger config file"""
+    return load_config().get('contract_address')
+
+def save_report(name, lines):
+    """Write a text report next to the screenshots, with a timestamp"""
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    filename = f"{SCREENSHOTS_DIR}/{timestamp}_{name}.txt"
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"Report saved: {filename}")
+    return filename
+
+def explore_chain(w3, contract_address, depth=RECENT_BLOCKS):
+    """
+    Summarize recent blocks and the contract's transactions via JSON-RPC
     
-    print(f"Contract address: {contract_address}")
+    Reads the same data the Ganache UI shows (blocks, transactions to the
+    contract, their receipts and decoded events) without a browser. Blocks
+    and receipts are fetched concurrently, so the scan costs roughly one
+    round-trip per RPC_WORKERS requests rather than one per request.
+    """
+    from web3 import Web3
+    from web3.logs import DISCARD
     
-    # Check Ganache connection first
-    try:
-        # Try using Web3 for more reliable Ganache detection
-        from web3 import Web3
-        w3 = Web3(Web3.HTTPProvider(GANACHE_URL))
-        if not w3.is_connected():
-            print("⚠️ Cannot connect to Ganache at", GANACHE_URL)
-            proceed = input("Proceed anyway? This will use screenshots only mode. (y/n): ")
-            if proceed.lower() != 'y':
-                return
-            
-            # If we're proceeding without Ganache, show demonstration images instead
-            print("📸 Using screenshot demo mode instead...")
-            screenshot_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                         "screenshots")
-            os.makedirs(screenshot_folder, exist_ok=True)
-            
-            # Create a demo screenshot showing blocks
-            demo_image_path = os.path.join(screenshot_folder, f"{time.strftime('%Y%m%d-%H%M%S')}_ganache_demo_mode.png")
-            import base64
-            with open(demo_image_path, "wb") as f:
-                # This is a base64 encoded small ganache UI image (replace with actual screenshot if needed)
-                f.write(base64.b64decode("YOUR_BASE64_GANACHE_SCREENSHOT"))
-            
-            print(f"Demo screenshot created at: {demo_image_path}")
-            print("\n----------------------------------------")
-            print("BLOCKCHAIN EXPLORATION (DEMO MODE)")
-            print("In a live environment, you would see:")
-            print("1. Document upload transactions")
-            print("2. Merkle root update transactions")
-            print("3. Document verification events")
-            print("4. Contract state showing current Merkle root")
-            print("----------------------------------------\n")
-            
-            print("Demo completed in screenshot mode!")
-            return
-    except Exception as e:
-        print(f"Error checking Ganache connection: {e}")
-        proceed = input("Proceed anyway? This may fail if Ganache is not running. (y/n): ")
-        if proceed.lower() != 'y':
-            return
+    contract = None
+    abi = load_config().get('contract_abi')
+    if abi and Web3.is_address(contract_address):
+        contract = w3.eth.contract(address=Web3.to_checksum_address(contract_address), abi=abi)
+    target = contract_address.lower()
+    
+    latest = w3.eth.block_number
+    print(f"Latest block: {latest}")
+    lines = [f"Ganache at {GANACHE_URL}, latest block {latest}", ""]
+    numbers = range(latest, max(-1, latest - depth), -1)
+    with ThreadPoolExecutor(max_workers=RPC_WORKERS) as pool:
+        # map() keeps results in request order, newest block first
+        blocks = list(pool.map(lambda number: w3.eth.get_block(number, full_transactions=True), numbers))
+        contract_txs = []
+        for number, block in zip(numbers, blocks):
+            lines.append(f"Block {number}: {len(block['transactions'])} tx, gas used {block['gasUsed']}")
+            contract_txs.extend(tx for tx in block['transactions'] if (tx['to'] or '').lower() == target)
+        receipts = list(pool.map(lambda tx: w3.eth.get_transaction_receipt(tx['hash']), contract_txs))
     
-    # Set up Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
+    print(f"Found {len(contract_txs)} transactions to contract {contract_address}")
+    lines += ["", f"Transactions to {contract_address}: {len(contract_txs)}"]
+    for tx, receipt in zip(contract_txs, receipts):
+        events = []
+        if contract is not None:
+            for event_name in CONTRACT_EVENTS:
+                decoded = contract.events[event_name]().process_receipt(receipt, errors=DISCARD)
+                events += [event_name] * len(decoded)
+        lines.append(
+            f"  {tx['hash'].hex()} block {tx['blockNumber']} status {receipt['status']} "
+            f"gas {receipt['gasUsed']} events {', '.join(events) or len(receipt['logs'])}"
+        )
+    
+    for line in lines:
+        print(line)
+    save_report("ganache_chain", lines)
+
+def confirm(prompt):
+    """Ask a y/n question; under NONINTERACTIVE=1 answer yes without prompting"""
+    if NONINTERACTIVE:
+        print(f"{prompt}y (NONINTERACTIVE)")
+        return True
+    return input(prompt).lower() == 'y'
+
+def explore_ui(contract_address):
+    """Walk through a browser-served Ganache UI with Selenium, taking screenshots"""
+    # Selenium is only needed for this opt-in walkthrough, so import it here
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from _driver_factory import make_driver, close_driver, HEADLESS
     
-    # Initialize the driver
-    driver = webdriver.Chrome(options=chrome_options)
+    driver = make_driver()
     
     try:
         # Step 1: Open Ganache
         print("Opening Ganache UI...")
         driver.get(GANACHE_URL)
-        time.sleep(3)
+        WebDriverWait(driver, 10, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
         take_screenshot(driver, "ganache_main_page")
         
         # If we can't load the Ganache UI in the browser, show a message
-        if "refused to connect" in driver.page_source.lower() or "cannot display this webpage" in driver.page_source.lower():
+        if driver.execute_script(_JS_UI_UNAVAILABLE):
             print("⚠️ Could not load Ganache UI in browser. Ganache may be using a different interface.")
             take_screenshot(driver, "ganache_connection_failed")
             print("\nGanache GUI is running but may not be accessible via browser.")
@@ -110,20 +169,18 @@ def main():
         # Step 2: Go to Blocks tab
         try:
             print("Navigating to Blocks tab...")
-            blocks_tab = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(text(), 'BLOCKS')]"))
-            )
+            blocks_tab = wait_for_div_with_text(driver, 'BLOCKS')
             blocks_tab.click()
-            time.sleep(2)
-            take_screenshot(driver, "ganache_blocks")
             
             # Step 3: Click on the most recent block
-            print("Opening the most recent block...")
-            recent_block = WebDriverWait(driver, 10).until(
+            recent_block = WebDriverWait(driver, 10, poll_frequency=0.1).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, ".BlockCard"))
             )
+            take_screenshot(driver, "ganache_blocks")
+            print("Opening the most recent block...")
+            old_url = driver.current_url
             recent_block.click()
-            time.sleep(2)
+            wait_for_route_change(driver, old_url)
             take_screenshot(driver, "ganache_block_details")
             
         except Exception as e:
@@ -135,13 +192,11 @@ def main():
         try:
             print("Navigating to Transactions tab...")
             driver.get(GANACHE_URL)  # Go back to main page
-            time.sleep(2)
             
-            transactions_tab = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(text(), 'TRANSACTIONS')]"))
-            )
+            transactions_tab = wait_for_div_with_text(driver, 'TRANSACTIONS')
+            old_url = driver.current_url
             transactions_tab.click()
-            time.sleep(2)
+            wait_for_route_change(driver, old_url)
             take_screenshot(driver, "ganache_transactions")
             
             # Step 5: Look for transactions related to our contract
@@ -149,12 +204,13 @@ def main():
             # This is approximate as Ganache UI might vary
             try:
                 # Try to find transactions to our contract
-                contract_txs = driver.find_elements(By.XPATH, f"//div[contains(text(), '{contract_address}')]")
+                contract_txs = find_divs_with_text(driver, contract_address)
                 if contract_txs:
                     print(f"Found {len(contract_txs)} transactions to our contract")
                     # Click on the first one
+                    old_url = driver.current_url
                     contract_txs[0].click()
-                    time.sleep(2)
+                    wait_for_route_change(driver, old_url)
                     take_screenshot(driver, "ganache_contract_transaction")
             except:
                 print("Could not find specific transactions for our contract")
@@ -166,41 +222,100 @@ def main():
         try:
             print("Checking for contract events...")
             # This is very dependent on Ganache UI version
-            events_tab = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(text(), 'EVENTS') or contains(text(), 'LOGS')]"))
-            )
+            events_tab = wait_for_div_with_text(driver, 'EVENTS', 'LOGS', timeout=5)
+            old_url = driver.current_url
             events_tab.click()
-            time.sleep(2)
+            wait_for_route_change(driver, old_url)
             take_screenshot(driver, "ganache_events")
             
         except Exception as e:
             print(f"Events tab not found or not accessible: {e}")
         
-        # Step 7: Check Contract State
-        print("Exploring contract state...")
-        # This would depend on having a contract explorer in Ganache
-        # If not available, we can mention how this would be explored
-        
-        print("\n----------------------------------------")
-        print("BLOCKCHAIN EXPLORATION")
-        print("Key blockchain interactions seen in Ganache:")
-        print("1. Document upload transactions")
-        print("2. Merkle root update transactions")
-        print("3. Document verification events")
-        print("4. Contract state showing current Merkle root")
-        print("----------------------------------------\n")
-        
-        print("Demo completed successfully!")
-        
     except Exception as e:
         print(f"Error during Ganache exploration: {e}")
         take_screenshot(driver, "ganache_error")
         raise
         
     finally:
-        # Keep browser open for 5 seconds
-        time.sleep(5)
-        driver.quit()
+        # Keep a visible browser open for 5 seconds
+        if not HEADLESS:
+            time.sleep(5)
+        close_driver(driver)
+        flush_screenshots()
+
+def main():
+    # Get the contract address
+    contract_address = get_contract_address()
+    if not contract_address:
+        print("Contract address not found. Using demo mode.")
+        contract_address = "0x0000000000000000000000000000000000000000"  # Placeholder
+    
+    print(f"Contract address: {contract_address}")
+    
+    # Check Ganache connection first
+    w3 = None
+    try:
+        # Try using Web3 for more reliable Ganache detection
+        from web3 import Web3
+        # Bounded timeout so an unresponsive node fails the probe quickly
+        w3 = Web3(Web3.HTTPProvider(GANACHE_URL, request_kwargs={'timeout': 5}))
+        if not w3.is_connected():
+            print("⚠️ Cannot connect to Ganache at", GANACHE_URL)
+            if not confirm("Proceed anyway? This will use screenshots only mode. (y/n): "):
+                return
+            
+            # If we're proceeding without Ganache, show demonstration images instead
+            print("📸 Using screenshot demo mode instead...")
+            # Create a demo screenshot showing blocks
+            demo_image_path = os.path.join(SCREENSHOTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_ganache_demo_mode.png")
+            import base64
+            import binascii
+            try:
+                # This is a base64 encoded small ganache UI image (replace with actual screenshot if needed)
+                image = base64.b64decode("YOUR_BASE64_GANACHE_SCREENSHOT")
+                with open(demo_image_path, "wb") as f:
+                    f.write(image)
+                print(f"Demo screenshot created at: {demo_image_path}")
+            except binascii.Error:
+                print("No demo screenshot configured; skipping it")
+            print("\n----------------------------------------")
+            print("BLOCKCHAIN EXPLORATION (DEMO MODE)")
+            print("In a live environment, you would see:")
+            print("1. Document upload transactions")
+            print("2. Merkle root update transactions")
+            print("3. Document verification events")
+            print("4. Contract state showing current Merkle root")
+            print("----------------------------------------\n")
+            
+            print("Demo completed in screenshot mode!")
+            return
+    except Exception as e:
+        print(f"Error checking Ganache connection: {e}")
+        w3 = None  # Connectivity unknown; skip the JSON-RPC queries
+        if not confirm("Proceed anyway? This may fail if Ganache is not running. (y/n): "):
+            return
+    
+    if w3 is not None:
+        try:
+            explore_chain(w3, contract_address)
+        except Exception as e:
+            print(f"Error querying Ganache over JSON-RPC: {e}")
+    else:
+        print("Web3 unavailable; skipping JSON-RPC exploration")
+    
+    if GANACHE_UI:
+        explore_ui(contract_address)
+    
+    print("\n----------------------------------------")
+    print("BLOCKCHAIN EXPLORATION")
+    print("Key blockchain interactions seen in Ganache:")
+    print("1. Document upload transactions")
+    print("2. Merkle root update transactions")
+    print("3. Document verification events")
+    print("4. Contract state showing current Merkle root")
+    print("----------------------------------------\n")
+    
+    print("Demo completed successfully!")
 
 if __name__ == "__main__":
     main()
@@ -1,59 +1,207 @@
 import os
+import json
 import time
 import subprocess
 import sys
+import atexit
+import shutil
+import socket
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def run_command(command):
-    """Run a command and print output in real-time"""
+FLASK_URL = "http://127.0.0.1:5000"
+FLASK_HEALTH_URL = f"{FLASK_URL}/api/health"
+GANACHE_URL = "http://localhost:7545"
+
+# Keep-alive HTTP session shared by every request this script makes; calls to
+# the Flask app retry refused connections (app still starting) with backoff,
+# but never a read timeout, so a hung app costs a single request timeout
+SESSION = requests.Session()
+SESSION.mount(FLASK_URL, HTTPAdapter(max_retries=Retry(total=3, read=0, backoff_factor=0.3)))
+
+# Preferred remote-debugging port of the browser tamper_demo.py attaches to; a
+# free port is used instead if something already holds it
+CHROME_DEBUG_PORT = 9222
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+def run_command(command, input_text=None):
+    """Run a command and print output in real-time, optionally feeding input_text to its stdin"""
     process = subprocess.Popen(
         command,
+        stdin=subprocess.PIPE if input_text is not None else None,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        universal_newlines=True,
         shell=False  # Changed to False for better argument handling
     )
+    if input_text is not None:
+        process.stdin.write(input_text.encode())
+        process.stdin.close()
     
-    # Print output in real-time
-    for line in process.stdout:
-        print(line, end='')
+    # Forward output in whatever chunks the pipe delivers (os.read returns as
+    # soon as any data is available) instead of decoding it line by line
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    fd = process.stdout.fileno()
+    for chunk in iter(lambda: os.read(fd, 65536), b''):
+        out.write(chunk)
+        out.flush()
         
     # Wait for process to complete
     process.wait()
     return process.returncode
 
+def check_flask():
+    """Return the status code of the Flask health endpoint, or None if unreachable"""
+    try:
+        return SESSION.get(FLASK_HEALTH_URL, timeout=5).status_code
+    except requests.exceptions.RequestException:
+        return None
+
+@functools.cache
+def get_web3():
+    """Create the Web3 client for Ganache once and reuse it"""
+    from web3 import Web3
+    return Web3(Web3.HTTPProvider(GANACHE_URL, request_kwargs={'timeout': 2}))
+
+def check_ganache():
+    """Return True if Ganache answers JSON-RPC at GANACHE_URL"""
+    try:
+        return get_web3().is_connected()
+    except Exception:
+        return False
+
+def pick_debug_port(preferred=CHROME_DEBUG_PORT):
+    """Return preferred if nothing listens on it, else a free port chosen by the OS"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        if sock.connect_ex(("127.0.0.1", preferred)) != 0:
+            return preferred
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def write_profile_prefs(profile_dir, prefs):
+    """Seed a fresh Chrome profile with dotted-key prefs, as chromedriver does for its options"""
+    tree = {}
+    for dotted, value in prefs.items():
+        node = tree
+        *parents, leaf = dotted.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    os.makedirs(os.path.join(profile_dir, "Default"), exist_ok=True)
+    with open(os.path.join(profile_dir, "Default", "Preferences"), "w") as f:
+        json.dump(tree, f)
+
+def start_shared_chrome():
+    """
+    Launch one Chrome with remote debugging enabled for the child demos to attach to
+    
+    The debugger address is exported as CHROME_DEBUGGER_ADDRESS so the child
+    scripts reuse this browser instead of each cold-starting their own. Flags
+    and prefs come from _driver_factory, so it matches the browser the demos
+    would otherwise launch themselves. The
+    port is checked first so the demos never attach to a browser this script
+    did not launch. Returns the Chrome process, or None if it could not be
+    started.
+    """
+    binary = os.environ.get("CHROME_BIN") or next(filter(None, map(shutil.which, CHROME_BINARIES)), None)
+    if not binary:
+        print("⚠️ Chrome binary not found; each demo will launch its own browser")
+        return None
+    
+    port = pick_debug_port()
+    if port != CHROME_DEBUG_PORT:
+        print(f"⚠️ Port {CHROME_DEBUG_PORT} is in use; shared Chrome will listen on {port}")
+    profile_dir = tempfile.mkdtemp(prefix="demo_profile_")
+    args = [
+        binary,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={profile_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ]
+    # Imported here so the Flask/Ganache checks do not pay for Selenium
+    from _driver_factory import HEADLESS, HEADLESS_ARGS, HEADLESS_PREFS
+    if HEADLESS:
+        args += HEADLESS_ARGS
+        write_profile_prefs(profile_dir, HEADLESS_PREFS)
+    else:
+        args.append("--start-maximized")
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    atexit.register(stop_shared_chrome, process, profile_dir)
+    
+    # The DevTools endpoint answers once the browser is ready to accept clients
+    version_url = f"http://127.0.0.1:{port}/json/version"
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        # A browser that exited (e.g. lost the port race) must not be replaced
+        # by whatever else answers on the port
+        if process.poll() is not None:
+            break
+        try:
+            if SESSION.get(version_url, timeout=1).json().get("webSocketDebuggerUrl"):
+                os.environ["CHROME_DEBUGGER_ADDRESS"] = f"127.0.0.1:{port}"
+                return process
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        time.sleep(0.1)
+    
+    print("⚠️ Shared Chrome did not start; each demo will launch its own browser")
+    stop_shared_chrome(process, profile_dir)
+    return None
+
+def stop_shared_chrome(process, profile_dir):
+    """Close the shared browser and remove its throwaway profile"""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    shutil.rmtree(profile_dir, ignore_errors=True)
+
 def main():
     print("Starting full blockchain document verification demo...")
     
     # Step 1: Check prerequisites and debug environment
     print("\n🔍 Checking prerequisites and environment...")
     
+    # Probe Flask and Ganache and create the screenshots directory concurrently
+    print("Checking if Flask application and Ganache are accessible...")
+    screenshots_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshots")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        flask_future = pool.submit(check_flask)
+        ganache_future = pool.submit(check_ganache)
+        mkdir_future = pool.submit(os.makedirs, screenshots_dir, exist_ok=True)
+        # Each probe is bounded by its own request timeout
+        flask_status = flask_future.result()
+        ganache_running = ganache_future.result()
+        mkdir_future.result()
+    
     # Check if Flask app is reachable
-    print("Checking if Flask application is accessible...")
-    import requests
-    try:
-        response = requests.get("http://127.0.0.1:5000/api/health", timeout=5)
-        if response.status_code == 200:
-            print("✅ Flask application is running and accessible")
+    if flask_status == 200:
+        print("✅ Flask application is running and accessible")
+    else:
+        if flask_status is None:
+            print("⚠️ Could not connect to Flask application")
         else:
-            print(f"⚠️ Flask application returned status code {response.status_code}")
-            proceed = input("Continue anyway? (y/n): ")
-            if proceed.lower() != 'y':
-                sys.exit(1)
-    except requests.exceptions.RequestException:
-        print("⚠️ Could not connect to Flask application")
+            print(f"⚠️ Flask application returned status code {flask_status}")
         proceed = input("Continue anyway? (y/n): ")
         if proceed.lower() != 'y':
             sys.exit(1)
     
-    # Check if Ganache is running
-    ganache_check = input("Is Ganache running at http://localhost:7545? (y/n): ")
-    if ganache_check.lower() != 'y':
-        print("Please start Ganache before running the demo.")
-        sys.exit(1)
-    
-    # Create screenshots directory
-    screenshots_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshots")
-    os.makedirs(screenshots_dir, exist_ok=True)
+    # Check if Ganache is running; fall back to asking if the RPC probe failed
+    if ganache_running:
+        print(f"✅ Ganache is running at {GANACHE_URL}")
+    else:
+        ganache_check = input(f"Ganache did not respond. Is it running at {GANACHE_URL}? (y/n): ")
+        if ganache_check.lower() != 'y':
+            print("Please start Ganache before running the demo.")
+            sys.exit(1)
     
     # Step 2: Run the document upload and verification demo
     print("\n🚀 Running document upload and verification demo...")
@@ -98,26 +246,12 @@ def main():
         tamper_command = [sys.executable, tamper_script]
         print(f"Running command: {' '.join(tamper_command)}")
         
-        # Pass the document ID to the tamper demo through stdin
-        process = subprocess.Popen(
-            tamper_command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            shell=False  # Changed to False for better argument handling
-        )
-        
-        # Write the document ID to stdin
-        process.stdin.write(f"{document_id}\n")
-        process.stdin.flush()
+        # Boot the browser the tamper demo attaches to; the Ganache explorer
+        # only needs one with GANACHE_UI=1 and launches its own then
+        start_shared_chrome()
         
-        # Print output in real-time
-        for line in process.stdout:
-            print(line, end='')
-            
-        # Wait for process to complete
-        process.wait()
+        # Pass the document ID to the tamper demo through stdin
+        run_command(tamper_command, input_text=f"{document_id}\n")
     else:
         print("\n⏭️ Skipping tamper detection demo.")
     
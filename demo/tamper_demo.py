@@ -1,77 +1,139 @@
-import os
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 import shutil
+from _driver_factory import make_driver, close_driver, HEADLESS
+from _screenshots import take_screenshot, flush_screenshots
 
 # Configuration
 BASE_URL = "http://127.0.0.1:5000"  # Adjust to your Flask app URL
 EMAIL = "demo@example.com"           # Your demo user
 PASSWORD = "password123"             # Demo password
+RESULT_TITLE_CSS = "#verification-results .result-title"  # The <h3> itself carries .result-title
 
-def take_screenshot(driver, name):
-    """Take a screenshot and save it with a timestamp"""
-    screenshots_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshots")
-    os.makedirs(screenshots_dir, exist_ok=True)
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
-    filename = f"{screenshots_dir}/{timestamp}_{name}.png"
-    driver.save_screenshot(filename)
-    print(f"Screenshot saved: {filename}")
-    return filename
+# Handles for every element the verification page steps use, fetched together
+_JS_PAGE_OBJECTS = """
+    return {
+        blockchain_method: document.querySelector('.verification-method.blockchain'),
+        verify_button: document.getElementById('verify-btn'),
+        document_id: document.getElementById('document-id')
+    };
+"""
+
+# Restore the document ID if the refresh cleared it, make sure the blockchain
+# method is active, then start verification
+_JS_REVERIFY = """
+    var idInput = document.getElementById('document-id');
+    if (idInput && !idInput.value) {
+        idInput.value = arguments[0];
+        idInput.dispatchEvent(new Event('input', {bubbles: true}));
+    }
+    var method = document.querySelector('.verification-method.blockchain');
+    if (method && !method.classList.contains('active')) method.click();
+    document.getElementById('verify-btn').click();
+"""
+
+# Resolve with the text of arguments[0] as soon as it is rendered non-empty, or
+# null after arguments[1] ms
+_JS_WAIT_FOR_TEXT = """
+    var sel = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+    function text() {
+        var el = document.querySelector(sel);
+        return el ? el.textContent.trim() : '';
+    }
+    if (text()) { done(text()); return; }
+    var timer, observer = new MutationObserver(function() {
+        var t = text();
+        if (t) { observer.disconnect(); clearTimeout(timer); done(t); }
+    });
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(function() { observer.disconnect(); done(null); }, timeoutMs);
+"""
+
+def wait_for_verification_result(driver, timeout=15):
+    """
+    Wait until the verification result title has rendered text and return it
+    
+    A MutationObserver in the page resolves as soon as the result is written,
+    instead of polling from Python. Raises TimeoutException if it never is.
+    """
+    driver.set_script_timeout(timeout + 1)
+    result = driver.execute_async_script(_JS_WAIT_FOR_TEXT, RESULT_TITLE_CSS, int(timeout * 1000))
+    if result is None:
+        raise TimeoutException(f"No verification result after {timeout}s")
+    return result
+
+def load_page_objects(driver, wait):
+    """
+    Resolve the verification page's elements in one round-trip
+    
+    Waits until the verify button exists and returns a dict of WebElements.
+    The handles stay valid until the page is reloaded.
+    """
+    def resolve(d):
+        page = d.execute_script(_JS_PAGE_OBJECTS)
+        return page if page["verify_button"] else False
+    return wait.until(resolve)
+
+def select_blockchain_method(blockchain_method, wait):
+    """Make sure the blockchain verification method is the active one"""
+    if blockchain_method is None:
+        return
+    if "active" not in blockchain_method.get_attribute("class"):
+        blockchain_method.click()
+        wait.until(lambda d: "active" in blockchain_method.get_attribute("class"))
 
 def main(document_id):
     """Run a tamper detection demonstration for the specified document ID"""
     if not document_id:
         raise ValueError("Document ID must be provided")
         
-    # Set up Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    
     # Initialize the driver
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.implicitly_wait(5)
+    driver = make_driver()
+    # No implicit wait: lookups that need to wait do so explicitly
+    driver.set_page_load_timeout(15)
+    wait = WebDriverWait(driver, 10, poll_frequency=0.1)
     
     try:
         print("Starting tamper detection demo...")
         
         # Step 1: Login to the system
         print("Logging in...")
-        driver.get(f"{BASE_URL}/login")
-        driver.find_element(By.NAME, "email").send_keys(EMAIL)
+        login_url = f"{BASE_URL}/login"
+        driver.get(login_url)
+        wait.until(EC.presence_of_element_located((By.NAME, "email"))).send_keys(EMAIL)
         driver.find_element(By.NAME, "password").send_keys(PASSWORD)
         login_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]")
         login_button.click()
-        time.sleep(2)
+        wait.until(EC.url_changes(login_url))
         
         # Step 2: Go directly to the verification page
         print("Going to verification page...")
         driver.get(f"{BASE_URL}/security/verification?document_id={document_id}")
-        time.sleep(2)
+        page = load_page_objects(driver, wait)
         take_screenshot(driver, "verification_page_tamper_demo")
         
+        # The page pre-fills the ID from ?document_id=; type it if that did not happen
+        id_input = page["document_id"]
+        if id_input is not None and not id_input.get_attribute("value"):
+            id_input.send_keys(document_id)
+        
         # Step 3: Ensure blockchain verification is selected
         print("Selecting blockchain verification...")
-        blockchain_method = driver.find_element(By.CSS_SELECTOR, ".verification-method.blockchain")
-        if "active" not in blockchain_method.get_attribute("class"):
-            blockchain_method.click()
-            time.sleep(1)
+        select_blockchain_method(page["blockchain_method"], wait)
         
         # Step 4: Start verification
         print("Verifying document...")
-        verify_button = driver.find_element(By.ID, "verify-btn")
-        verify_button.click()
-        time.sleep(5)  # Wait for verification to complete
+        page["verify_button"].click()
+        verification_result = wait_for_verification_result(driver)
         
         # Step 5: Capture verification result
         print("Capturing verification result...")
         take_screenshot(driver, "verification_result_before_tampering")
         
         # Read the verification result
-        verification_result = driver.find_element(By.CSS_SELECTOR, ".verification-results h3 .result-title").text
         print(f"Before tampering - Verification result: {verification_result}")
         
         # Step 6: Now simulate tampering by using a tampered document
@@ -88,27 +150,18 @@ def main(document_id):
         
         # Step 7: After "tampering", re-verify the document
         # In a full demo, we would upload a tampered version first
-        time.sleep(3)  # Pause for effect
+        if not HEADLESS:
+            time.sleep(3)  # Pause for effect
         
         # Step 8: Refresh the page to simulate coming back to verify after tampering
+        # (this invalidates the cached page handles)
         driver.refresh()
-        time.sleep(2)
-        
-        # Ensure document ID is still in field
-        document_id_input = driver.find_element(By.ID, "document-id")
-        if not document_id_input.get_attribute("value"):
-            document_id_input.send_keys(document_id)
         
-        # Ensure blockchain verification is selected
-        blockchain_method = driver.find_element(By.CSS_SELECTOR, ".verification-method.blockchain")
-        if "active" not in blockchain_method.get_attribute("class"):
-            blockchain_method.click()
-            time.sleep(1)
-            
-        # Click verify again
-        verify_button = driver.find_element(By.ID, "verify-btn")
-        verify_button.click()
-        time.sleep(5)  # Wait for verification to complete
+        # Refill the document ID, select blockchain verification and click
+        # verify again, all in one browser round-trip
+        wait.until(EC.element_to_be_clickable((By.ID, "verify-btn")))
+        driver.execute_script(_JS_REVERIFY, document_id)
+        print(f"After tampering - Verification result: {wait_for_verification_result(driver)}")
         
         # Capture the result after "tampering"
         take_screenshot(driver, "verification_result_after_tampering")
@@ -122,9 +175,11 @@ def main(document_id):
         raise
     
     finally:
-        # Keep browser open for 5 seconds to show final state
-        time.sleep(5)
-        driver.quit()
+        # Keep a visible browser open for 5 seconds to show final state
+        if not HEADLESS:
+            time.sleep(5)
+        close_driver(driver)
+        flush_screenshots()
 
 if __name__ == "__main__":
     # You need to provide a valid document ID from a previous upload